@@ -32,6 +32,19 @@ def health_check() -> dict:
     return {"status": "ok", "message": "VibeProteins Modal ready"}
 
 
+# Map job types to their functions
+_JOB_DISPATCH = {
+    "health": health_check,
+    "rfdiffusion3": run_rfdiffusion3,
+    "proteinmpnn": run_proteinmpnn,
+    "boltz2": run_boltz2,
+    "boltzgen": run_boltzgen,
+    "predict": run_structure_prediction,
+    "score": compute_scores,
+    "msa": run_msa_search,
+}
+
+
 @app.function(image=cpu_image, timeout=3600, secrets=[sentry_secret])
 @modal.fastapi_endpoint(method="POST")
 def submit_job(request: dict) -> dict:
@@ -51,24 +64,11 @@ def submit_job(request: dict) -> dict:
     params = request.get("params", {})
     async_mode = request.get("async", False)
 
-    # Map job types to their functions
-    job_functions = {
-        "health": health_check,
-        "rfdiffusion3": run_rfdiffusion3,
-        "proteinmpnn": run_proteinmpnn,
-        "boltz2": run_boltz2,
-        "boltzgen": run_boltzgen,
-        "predict": run_structure_prediction,
-        "score": compute_scores,
-        "msa": run_msa_search,
-    }
-
-    if job_type not in job_functions:
+    func = _JOB_DISPATCH.get(job_type)
+    if func is None:
         return {"status": "error", "message": f"Unknown job type: {job_type}"}
 
-    func = job_functions[job_type]
-
-    # Health check is always sync
+    # Health check is always sync and takes no params
     if job_type == "health":
         return func.remote()
 
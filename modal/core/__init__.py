@@ -2,46 +2,52 @@
 Core configuration and utilities for Modal functions.
 """
 
-from core.config import (
-    app,
-    job_status_dict,
-    gpu_image,
-    cpu_image,
-    boltz_image,
-    proteinmpnn_image,
-    rfdiffusion3_image,
-    boltzgen_image,
-    msa_image,
-    r2_secret,
-    colabfold_volume,
-    RESULTS_PREFIX,
-    BOLTZ_CACHE_DIR,
-    BOLTZ_MODEL_VOLUME,
-    BOLTZ_USE_MSA_SERVER,
-    BOLTZ_MSA_TIMEOUT_SECONDS,
-    BOLTZ_EXTRA_ARGS,
-    RFD3_MODELS_DIR,
-    RFD3_MODEL_VOLUME,
-    RFD3_CHECKPOINT_FILENAME,
-    RFD3_HOTSPOT_ATOMS,
-    RFD3_LOW_MEMORY_MODE,
-    RFD3_EXTRA_ARGS,
-    RFD3_MAX_BATCH_SIZE,
-    PROTEINMPNN_DIR,
-    PROTEINMPNN_MODEL_NAME,
-    PROTEINMPNN_SAMPLING_TEMP,
-    PROTEINMPNN_BATCH_SIZE,
-    BOLTZGEN_CACHE_DIR,
-    BOLTZGEN_MODEL_VOLUME,
-    COLABFOLD_DB_DIR,
-)
+import importlib
 
-from core.job_status import (
-    get_job_status,
-    update_job_status,
-    send_progress,
-    send_completion,
-)
+# Resolved on first attribute access so importing a light submodule such as
+# core.constants does not construct the Modal app, images and volumes.
+_EXPORTS = {
+    "app": "core.config",
+    "job_status_dict": "core.config",
+    "gpu_image": "core.config",
+    "cpu_image": "core.config",
+    "boltz_image": "core.config",
+    "proteinmpnn_image": "core.config",
+    "rfdiffusion3_image": "core.config",
+    "boltzgen_image": "core.config",
+    "msa_image": "core.config",
+    "r2_secret": "core.config",
+    "colabfold_volume": "core.config",
+    "BOLTZ_MODEL_VOLUME": "core.config",
+    "RFD3_MODEL_VOLUME": "core.config",
+    "BOLTZGEN_MODEL_VOLUME": "core.config",
+    "RESULTS_PREFIX": "core.constants",
+    "BOLTZ_CACHE_DIR": "core.constants",
+    "BOLTZ_USE_MSA_SERVER": "core.constants",
+    "BOLTZ_MSA_TIMEOUT_SECONDS": "core.constants",
+    "BOLTZ_MSA_BASE_TIMEOUT_SECONDS": "core.constants",
+    "BOLTZ_MSA_MIN_TIMEOUT_SECONDS": "core.constants",
+    "BOLTZ_MSA_TIMEOUT_PER_RESIDUE": "core.constants",
+    "BOLTZ_MSA_TIMEOUT_PER_CHAIN": "core.constants",
+    "BOLTZ_EXTRA_ARGS": "core.constants",
+    "RFD3_MODELS_DIR": "core.constants",
+    "RFD3_CHECKPOINT_FILENAME": "core.constants",
+    "RFD3_HOTSPOT_ATOMS": "core.constants",
+    "RFD3_LOW_MEMORY_MODE": "core.constants",
+    "RFD3_EXTRA_ARGS": "core.constants",
+    "RFD3_MAX_BATCH_SIZE": "core.constants",
+    "PROTEINMPNN_DIR": "core.constants",
+    "PROTEINMPNN_MODEL_NAME": "core.constants",
+    "PROTEINMPNN_SAMPLING_TEMP": "core.constants",
+    "PROTEINMPNN_BATCH_SIZE": "core.constants",
+    "BOLTZGEN_CACHE_DIR": "core.constants",
+    "COLABFOLD_DB_DIR": "core.constants",
+    "get_job_status": "core.job_status",
+    "update_job_status": "core.job_status",
+    "send_progress": "core.job_status",
+    "send_completion": "core.job_status",
+    "flush_job_status": "core.job_status",
+}
 
 __all__ = [
     # App
@@ -66,6 +72,10 @@ __all__ = [
     "BOLTZ_CACHE_DIR",
     "BOLTZ_USE_MSA_SERVER",
     "BOLTZ_MSA_TIMEOUT_SECONDS",
+    "BOLTZ_MSA_BASE_TIMEOUT_SECONDS",
+    "BOLTZ_MSA_MIN_TIMEOUT_SECONDS",
+    "BOLTZ_MSA_TIMEOUT_PER_RESIDUE",
+    "BOLTZ_MSA_TIMEOUT_PER_CHAIN",
     "BOLTZ_EXTRA_ARGS",
     "RFD3_MODELS_DIR",
     "RFD3_CHECKPOINT_FILENAME",
@@ -84,4 +94,14 @@ __all__ = [
     "update_job_status",
     "send_progress",
     "send_completion",
+    "flush_job_status",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
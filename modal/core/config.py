@@ -3,16 +3,62 @@ Modal configuration: images, volumes, secrets, and constants.
 """
 
 import os
-from pathlib import Path
 
 import modal
 
+from core.constants import (  # noqa: F401 - re-exported for existing callers
+    BOLTZ_CACHE_DIR,
+    BOLTZ_VOLUME_NAME,
+    RFD3_MODELS_DIR,
+    RFD3_VOLUME_NAME,
+    BOLTZGEN_CACHE_DIR,
+    BOLTZGEN_VOLUME_NAME,
+    BOLTZGEN_WORK_DIR,
+    BOLTZGEN_WORK_VOLUME_NAME,
+    MBER_WEIGHTS_DIR,
+    MBER_VOLUME_NAME,
+    MBER_WORK_DIR,
+    MBER_WORK_VOLUME_NAME,
+    MOSAIC_WORK_DIR,
+    MOSAIC_WORK_VOLUME_NAME,
+    COLABFOLD_VOLUME_NAME,
+    COLABFOLD_DB_DIR,
+    RESULTS_PREFIX,
+    PROTEINMPNN_DIR,
+    RFD3_CHECKPOINT_FILENAME,
+    RFD3_HOTSPOT_ATOMS,
+    RFD3_LOW_MEMORY_MODE,
+    RFD3_EXTRA_ARGS,
+    RFD3_MAX_BATCH_SIZE,
+    PROTEINMPNN_MODEL_NAME,
+    PROTEINMPNN_SAMPLING_TEMP,
+    PROTEINMPNN_BATCH_SIZE,
+    BOLTZ_USE_MSA_SERVER,
+    BOLTZ_MSA_TIMEOUT_SECONDS,
+    BOLTZ_MSA_BASE_TIMEOUT_SECONDS,
+    BOLTZ_MSA_MIN_TIMEOUT_SECONDS,
+    BOLTZ_MSA_TIMEOUT_PER_RESIDUE,
+    BOLTZ_MSA_TIMEOUT_PER_CHAIN,
+    BOLTZ_EXTRA_ARGS,
+    BOLTZGEN_DEFAULT_PROTOCOL,
+    BOLTZGEN_DEFAULT_NUM_DESIGNS,
+    BOLTZGEN_DEFAULT_BUDGET,
+    BOLTZGEN_EXTRA_ARGS,
+)
 from integrations.mber import pip_specs_for_mber
 from integrations.mosaic import pip_specs_for_mosaic
 
 
+_sentry_initialized = False
+
+
 def init_sentry():
-    """Initialize Sentry SDK for error tracking."""
+    """Initialize Sentry SDK for error tracking, once per process."""
+    global _sentry_initialized
+    if _sentry_initialized:
+        return
+    _sentry_initialized = True
+
     import sentry_sdk  # Import inside function to avoid local dependency
 
     dsn = os.environ.get("SENTRY_DSN")
@@ -37,10 +83,11 @@ RFD3_TORCH_VERSION = "2.3.1"
 BOLTZGEN_TORCH_VERSION = "2.5.1"
 MOSAIC_TORCH_VERSION = "2.7.1"
 
-COMMON_PY_PKGS = [
+COMMON_PY_PKGS = (
     "boto3",
+    "orjson>=3.9",
     "biopython",
-    "numpy<2.0",
+    "numpy>=1.26,<2.0",
     "packaging",
     "scipy",
     "requests",
@@ -48,10 +95,11 @@ COMMON_PY_PKGS = [
     "wheel",
     "fastapi[standard]",
     "sentry-sdk>=2.0.0",
-]
+)
 
-MOSAIC_PY_PKGS = [
+MOSAIC_PY_PKGS = (
     "boto3",
+    "orjson>=3.9",
     "requests",
     "sentry-sdk>=2.0.0",
     "numpy==2.1",
@@ -60,10 +108,11 @@ MOSAIC_PY_PKGS = [
     "equinox>=0.13.0",
     "jaxtyping",
     "tqdm",
-]
+)
 
-MOSAIC_GPU_PY_PKGS = [
+MOSAIC_GPU_PY_PKGS = (
     "boto3",
+    "orjson>=3.9",
     "requests",
     "sentry-sdk>=2.0.0",
     "numpy==2.1",
@@ -74,7 +123,7 @@ MOSAIC_GPU_PY_PKGS = [
     "tqdm",
     "gemmi>=0.6.5",
     "ml-collections>=1.0.0",
-]
+)
 
 
 def _add_local_sources(image: modal.Image) -> modal.Image:
@@ -88,55 +137,90 @@ def _add_local_sources(image: modal.Image) -> modal.Image:
     )
 
 
+def _pip_install_no_deps(*specs: str, extra_index_url: str | None = None) -> str:
+    """Build a pip command that installs pinned packages without resolving deps."""
+    command = "pip install --no-deps " + " ".join(specs)
+    if extra_index_url:
+        command += f" --extra-index-url {extra_index_url}"
+    return command
+
+
 # Docker images
-gpu_image = _add_local_sources(
-    modal.Image.debian_slim(python_version="3.11")
-    .apt_install("git")
-    .pip_install(*COMMON_PY_PKGS)
-    .pip_install(
-        "torch==2.1.2",
-        "torchvision==0.16.2",
-        "torchaudio==2.1.2",
-        extra_index_url=TORCH_INDEX,
+# Layers are ordered most-stable-first: the multi-GB pinned torch install
+# sits directly on debian_slim, ahead of apt packages and COMMON_PY_PKGS, so
+# bumping a common package or apt dependency reuses the cached torch layer.
+# Images pinning the same torch (gpu/proteinmpnn) share that layer outright.
+# Images without torch start from base_py311_image, which carries the common
+# install once for all of them. torchvision/torchaudio are exact companions of
+# the pinned torch and need nothing else, so they skip resolution.
+def _base_image(python_version: str, image_id_env: str) -> modal.Image:
+    """Build the shared base image, or reuse a pinned prebuilt one.
+
+    Setting ``image_id_env`` to a previously built image's ``object_id`` lets CI
+    derive every child image from that exact base instead of rebuilding it
+    whenever the Modal client's image builder version or cache changes.
+    """
+    image_id = os.environ.get(image_id_env)
+    if image_id:
+        return modal.Image.from_id(image_id)
+    return modal.Image.debian_slim(python_version=python_version).pip_install(
+        *COMMON_PY_PKGS
     )
+
+
+base_py311_image = _base_image("3.11", "MODAL_BASE_PY311_IMAGE_ID")
+base_py312_image = _base_image("3.12", "MODAL_BASE_PY312_IMAGE_ID")
+
+torch_2_1_py311_image = modal.Image.debian_slim(python_version="3.11").pip_install(
+    "torch==2.1.2", extra_index_url=TORCH_INDEX
 )
 
-cpu_image = _add_local_sources(
-    modal.Image.debian_slim(python_version="3.11").pip_install(*COMMON_PY_PKGS)
+gpu_image = _add_local_sources(
+    torch_2_1_py311_image.apt_install("git")
+    .pip_install(*COMMON_PY_PKGS, "pillow")
+    .run_commands(
+        _pip_install_no_deps(
+            "torchvision==0.16.2", "torchaudio==2.1.2", extra_index_url=TORCH_INDEX
+        )
+    )
 )
 
+cpu_image = _add_local_sources(base_py311_image)
+
 boltz_image = _add_local_sources(
     modal.Image.debian_slim(python_version="3.11")
+    .pip_install(f"torch=={BOLTZ_TORCH_VERSION}")
     .apt_install("git", "libxrender1", "libxext6", "libsm6")
-    .pip_install(*COMMON_PY_PKGS)
-    .pip_install(
-        f"torch=={BOLTZ_TORCH_VERSION}",
-        f"torchvision=={BOLTZ_TORCHVISION_VERSION}",
-        f"torchaudio=={BOLTZ_TORCHAUDIO_VERSION}",
-        "boltz[cuda]==2.2.1",
+    .pip_install(*COMMON_PY_PKGS, "pillow", "boltz[cuda]==2.2.1")
+    .run_commands(
+        _pip_install_no_deps(
+            f"torchvision=={BOLTZ_TORCHVISION_VERSION}",
+            f"torchaudio=={BOLTZ_TORCHAUDIO_VERSION}",
+        )
     )
 )
 
 proteinmpnn_image = _add_local_sources(
-    modal.Image.debian_slim(python_version="3.11")
-    .apt_install("git")
-    .pip_install(*COMMON_PY_PKGS)
-    .pip_install(
-        "torch==2.1.2",
-        "torchvision==0.16.2",
-        "torchaudio==2.1.2",
-        extra_index_url=TORCH_INDEX,
+    torch_2_1_py311_image.apt_install("git")
+    .pip_install(*COMMON_PY_PKGS, "pillow")
+    .run_commands(
+        _pip_install_no_deps(
+            "torchvision==0.16.2", "torchaudio==2.1.2", extra_index_url=TORCH_INDEX
+        )
+    )
+    .run_commands(
+        "git clone --depth 1 --single-branch "
+        "https://github.com/dauparas/ProteinMPNN.git /proteinmpnn"
     )
-    .run_commands("git clone https://github.com/dauparas/ProteinMPNN.git /proteinmpnn")
 )
 
+# RFD3 keeps torch last: the pinned CUDA torch deliberately overrides whatever
+# rc-foundry pulls in, and installing it first would let rc-foundry replace it.
 rfdiffusion3_image = _add_local_sources(
-    modal.Image.debian_slim(python_version="3.12")
-    .apt_install(
+    base_py312_image.apt_install(
         "git", "libgomp1", "libglib2.0-0", "libgl1", "libsm6", "libxext6", "libxrender1"
     )
-    .pip_install(*COMMON_PY_PKGS)
-    .pip_install("rc-foundry[rfd3]")
+    .pip_install("rc-foundry[rfd3]", "gemmi>=0.6.5")
     .pip_install(
         f"torch=={RFD3_TORCH_VERSION}",
         extra_index_url=RFD3_TORCH_INDEX,
@@ -146,6 +230,7 @@ rfdiffusion3_image = _add_local_sources(
 
 boltzgen_image = _add_local_sources(
     modal.Image.debian_slim(python_version="3.11")
+    .pip_install(f"torch=={BOLTZGEN_TORCH_VERSION}", extra_index_url=TORCH_INDEX)
     .apt_install(
         "git",
         "libgomp1",
@@ -156,12 +241,7 @@ boltzgen_image = _add_local_sources(
         "libxrender1",
         "wget",
     )
-    .pip_install(*COMMON_PY_PKGS)
-    .pip_install(
-        f"torch=={BOLTZGEN_TORCH_VERSION}",
-        extra_index_url=TORCH_INDEX,
-    )
-    .pip_install("boltzgen")
+    .pip_install(*COMMON_PY_PKGS, "boltzgen", "gemmi>=0.6.5")
 )
 
 mosaic_image = _add_local_sources(
@@ -173,20 +253,15 @@ mosaic_image = _add_local_sources(
 
 mosaic_gpu_image = _add_local_sources(
     modal.Image.debian_slim(python_version="3.12")
+    .pip_install(f"torch=={MOSAIC_TORCH_VERSION}", extra_index_url=TORCH_INDEX)
     .apt_install("git", "libgomp1")
-    .pip_install(*MOSAIC_GPU_PY_PKGS)
-    .pip_install(
-        f"torch=={MOSAIC_TORCH_VERSION}",
-        extra_index_url=TORCH_INDEX,
-    )
-    .pip_install("boltz[cuda]==2.2.1")
+    .pip_install(*MOSAIC_GPU_PY_PKGS, "boltz[cuda]==2.2.1")
     .run_commands("pip install --no-deps git+https://github.com/nboyd/joltz")
     .run_commands(f"pip install --no-deps {pip_specs_for_mosaic()[0]}")
 )
 
 mber_image = _add_local_sources(
-    modal.Image.debian_slim(python_version="3.11")
-    .apt_install(
+    base_py311_image.apt_install(
         "git",
         "wget",
         "libgomp1",
@@ -196,103 +271,35 @@ mber_image = _add_local_sources(
         "libxext6",
         "libxrender1",
     )
-    .pip_install(*COMMON_PY_PKGS)
     .pip_install(*pip_specs_for_mber())
 )
 
-msa_image = _add_local_sources(
-    modal.Image.debian_slim(python_version="3.11")
-    .apt_install("mmseqs2", "wget")
-    .pip_install(*COMMON_PY_PKGS)
-)
+msa_image = _add_local_sources(base_py311_image.apt_install("mmseqs2", "wget"))
 
 # Secrets
 r2_secret = modal.Secret.from_name("r2-credentials")
 sentry_secret = modal.Secret.from_name("sentry-dsn", required_keys=["SENTRY_DSN"])
 
 # Volumes
-BOLTZ_CACHE_DIR = "/boltz-cache"
-BOLTZ_VOLUME_NAME = os.environ.get("BOLTZ_VOLUME_NAME", "boltz-models")
 BOLTZ_MODEL_VOLUME = modal.Volume.from_name(BOLTZ_VOLUME_NAME, create_if_missing=True)
-
-RFD3_MODELS_DIR = Path("/rfd3-models")
-RFD3_VOLUME_NAME = os.environ.get("RFD3_VOLUME_NAME", "rfd3-models")
 RFD3_MODEL_VOLUME = modal.Volume.from_name(RFD3_VOLUME_NAME, create_if_missing=True)
-
-BOLTZGEN_CACHE_DIR = "/boltzgen-cache"
-BOLTZGEN_VOLUME_NAME = os.environ.get("BOLTZGEN_VOLUME_NAME", "boltzgen-models")
 BOLTZGEN_MODEL_VOLUME = modal.Volume.from_name(
     BOLTZGEN_VOLUME_NAME, create_if_missing=True
 )
 
 # BoltzGen work directory volume for preemption recovery
-BOLTZGEN_WORK_DIR = "/boltzgen-work"
-BOLTZGEN_WORK_VOLUME_NAME = os.environ.get("BOLTZGEN_WORK_VOLUME_NAME", "boltzgen-work")
 BOLTZGEN_WORK_VOLUME = modal.Volume.from_name(
     BOLTZGEN_WORK_VOLUME_NAME, create_if_missing=True
 )
 
-MBER_WEIGHTS_DIR = "/root/.mber"
-MBER_VOLUME_NAME = os.environ.get("MBER_VOLUME_NAME", "mber-weights")
 MBER_MODEL_VOLUME = modal.Volume.from_name(MBER_VOLUME_NAME, create_if_missing=True)
-
-MBER_WORK_DIR = "/mber-work"
-MBER_WORK_VOLUME_NAME = os.environ.get("MBER_WORK_VOLUME_NAME", "mber-work")
 MBER_WORK_VOLUME = modal.Volume.from_name(MBER_WORK_VOLUME_NAME, create_if_missing=True)
-
-MOSAIC_WORK_DIR = "/mosaic-work"
-MOSAIC_WORK_VOLUME_NAME = os.environ.get("MOSAIC_WORK_VOLUME_NAME", "mosaic-work")
 MOSAIC_WORK_VOLUME = modal.Volume.from_name(
     MOSAIC_WORK_VOLUME_NAME, create_if_missing=True
 )
-
-COLABFOLD_VOLUME_NAME = os.environ.get("COLABFOLD_VOLUME_NAME", "colabfold-dbs")
-COLABFOLD_DB_DIR = Path("/colabfold-dbs")
 colabfold_volume = modal.Volume.from_name(COLABFOLD_VOLUME_NAME, create_if_missing=True)
 
 # Job status Dict
 job_status_dict = modal.Dict.from_name(
     "vibeproteins-job-status", create_if_missing=True
 )
-
-# Environment configuration
-RESULTS_PREFIX = os.environ.get("DESIGN_RESULTS_PREFIX", "designs").strip("/")
-PROTEINMPNN_DIR = Path("/proteinmpnn")
-
-# RFD3 configuration
-RFD3_CHECKPOINT_FILENAME = os.environ.get(
-    "RFD3_CHECKPOINT_FILENAME", "rfd3_latest.ckpt"
-)
-RFD3_HOTSPOT_ATOMS = os.environ.get("RFD3_HOTSPOT_ATOMS", "ALL")
-RFD3_LOW_MEMORY_MODE = os.environ.get("RFD3_LOW_MEMORY_MODE", "0").lower() in {
-    "1",
-    "true",
-    "yes",
-    "on",
-}
-RFD3_EXTRA_ARGS = os.environ.get("RFD3_EXTRA_ARGS", "")
-RFD3_MAX_BATCH_SIZE = int(os.environ.get("RFD3_MAX_BATCH_SIZE", "8"))
-
-# ProteinMPNN configuration
-PROTEINMPNN_MODEL_NAME = os.environ.get("PROTEINMPNN_MODEL_NAME", "v_48_020")
-PROTEINMPNN_SAMPLING_TEMP = os.environ.get("PROTEINMPNN_SAMPLING_TEMP", "0.1")
-PROTEINMPNN_BATCH_SIZE = int(os.environ.get("PROTEINMPNN_BATCH_SIZE", "1"))
-
-# Boltz configuration
-BOLTZ_USE_MSA_SERVER = os.environ.get("BOLTZ_USE_MSA_SERVER", "1").lower() in {
-    "1",
-    "true",
-    "yes",
-    "on",
-}
-BOLTZ_MSA_TIMEOUT_SECONDS = int(os.environ.get("BOLTZ_MSA_TIMEOUT_SECONDS", "600"))
-BOLTZ_EXTRA_ARGS = os.environ.get("BOLTZ_EXTRA_ARGS", "")
-
-# BoltzGen configuration
-BOLTZGEN_DEFAULT_PROTOCOL = os.environ.get(
-    "BOLTZGEN_DEFAULT_PROTOCOL", "protein-anything"
-)
-BOLTZGEN_DEFAULT_NUM_DESIGNS = int(
-    os.environ.get("BOLTZGEN_DEFAULT_NUM_DESIGNS", "100")
-)
-BOLTZGEN_DEFAULT_BUDGET = int(os.environ.get("BOLTZGEN_DEFAULT_BUDGET", "10"))
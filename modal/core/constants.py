@@ -0,0 +1,88 @@
+"""
+Environment-derived settings and mount paths.
+
+Kept free of Modal imports so helpers and tests that only need these values
+do not have to build the app, image and volume definitions in core.config.
+"""
+
+import os
+from pathlib import Path
+
+_TRUTHY_ENV_VALUES = frozenset({"1", "true", "yes", "on"})
+
+
+def _env_flag(name: str, default: str) -> bool:
+    """Read a boolean flag from the environment."""
+    return os.environ.get(name, default).lower() in _TRUTHY_ENV_VALUES
+
+
+# Volume mount paths and names
+BOLTZ_CACHE_DIR = "/boltz-cache"
+BOLTZ_VOLUME_NAME = os.environ.get("BOLTZ_VOLUME_NAME", "boltz-models")
+
+RFD3_MODELS_DIR = Path("/rfd3-models")
+RFD3_VOLUME_NAME = os.environ.get("RFD3_VOLUME_NAME", "rfd3-models")
+
+BOLTZGEN_CACHE_DIR = "/boltzgen-cache"
+BOLTZGEN_VOLUME_NAME = os.environ.get("BOLTZGEN_VOLUME_NAME", "boltzgen-models")
+
+# BoltzGen work directory volume for preemption recovery
+BOLTZGEN_WORK_DIR = "/boltzgen-work"
+BOLTZGEN_WORK_VOLUME_NAME = os.environ.get("BOLTZGEN_WORK_VOLUME_NAME", "boltzgen-work")
+
+MBER_WEIGHTS_DIR = "/root/.mber"
+MBER_VOLUME_NAME = os.environ.get("MBER_VOLUME_NAME", "mber-weights")
+
+MBER_WORK_DIR = "/mber-work"
+MBER_WORK_VOLUME_NAME = os.environ.get("MBER_WORK_VOLUME_NAME", "mber-work")
+
+MOSAIC_WORK_DIR = "/mosaic-work"
+MOSAIC_WORK_VOLUME_NAME = os.environ.get("MOSAIC_WORK_VOLUME_NAME", "mosaic-work")
+
+COLABFOLD_VOLUME_NAME = os.environ.get("COLABFOLD_VOLUME_NAME", "colabfold-dbs")
+COLABFOLD_DB_DIR = Path("/colabfold-dbs")
+
+# Environment configuration
+RESULTS_PREFIX = os.environ.get("DESIGN_RESULTS_PREFIX", "designs").strip("/")
+PROTEINMPNN_DIR = Path("/proteinmpnn")
+
+# RFD3 configuration
+RFD3_CHECKPOINT_FILENAME = os.environ.get(
+    "RFD3_CHECKPOINT_FILENAME", "rfd3_latest.ckpt"
+)
+RFD3_HOTSPOT_ATOMS = os.environ.get("RFD3_HOTSPOT_ATOMS", "ALL")
+RFD3_LOW_MEMORY_MODE = _env_flag("RFD3_LOW_MEMORY_MODE", "0")
+RFD3_EXTRA_ARGS = os.environ.get("RFD3_EXTRA_ARGS", "")
+RFD3_MAX_BATCH_SIZE = int(os.environ.get("RFD3_MAX_BATCH_SIZE", "8"))
+
+# ProteinMPNN configuration
+PROTEINMPNN_MODEL_NAME = os.environ.get("PROTEINMPNN_MODEL_NAME", "v_48_020")
+PROTEINMPNN_SAMPLING_TEMP = os.environ.get("PROTEINMPNN_SAMPLING_TEMP", "0.1")
+PROTEINMPNN_BATCH_SIZE = int(os.environ.get("PROTEINMPNN_BATCH_SIZE", "1"))
+
+# Boltz configuration
+BOLTZ_USE_MSA_SERVER = _env_flag("BOLTZ_USE_MSA_SERVER", "1")
+# MSA server timeout scales with complex size:
+#   max(MIN, BASE + PER_RESIDUE * total_residues + PER_CHAIN * num_chains)
+# BOLTZ_MSA_TIMEOUT_SECONDS keeps its meaning as the total timeout: when set it
+# overrides the scaled value entirely.
+BOLTZ_MSA_TIMEOUT_SECONDS = (
+    int(os.environ["BOLTZ_MSA_TIMEOUT_SECONDS"])
+    if os.environ.get("BOLTZ_MSA_TIMEOUT_SECONDS")
+    else None
+)
+BOLTZ_MSA_BASE_TIMEOUT_SECONDS = int(os.environ.get("BOLTZ_MSA_BASE_TIMEOUT_SECONDS", "300"))
+BOLTZ_MSA_MIN_TIMEOUT_SECONDS = int(os.environ.get("BOLTZ_MSA_MIN_TIMEOUT_SECONDS", "180"))
+BOLTZ_MSA_TIMEOUT_PER_RESIDUE = float(os.environ.get("BOLTZ_MSA_TIMEOUT_PER_RESIDUE", "0.25"))
+BOLTZ_MSA_TIMEOUT_PER_CHAIN = float(os.environ.get("BOLTZ_MSA_TIMEOUT_PER_CHAIN", "60"))
+BOLTZ_EXTRA_ARGS = os.environ.get("BOLTZ_EXTRA_ARGS", "")
+
+# BoltzGen configuration
+BOLTZGEN_DEFAULT_PROTOCOL = os.environ.get(
+    "BOLTZGEN_DEFAULT_PROTOCOL", "protein-anything"
+)
+BOLTZGEN_DEFAULT_NUM_DESIGNS = int(
+    os.environ.get("BOLTZGEN_DEFAULT_NUM_DESIGNS", "100")
+)
+BOLTZGEN_DEFAULT_BUDGET = int(os.environ.get("BOLTZGEN_DEFAULT_BUDGET", "10"))
+BOLTZGEN_EXTRA_ARGS = os.environ.get("BOLTZGEN_EXTRA_ARGS", "")
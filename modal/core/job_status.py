@@ -5,19 +5,123 @@ Provides functions to track job progress and completion without
 requiring a public callback URL.
 """
 
+import atexit
+import copy
+import threading
 import time
 
 from core.config import job_status_dict
 
-
-def get_job_status(job_id: str) -> dict | None:
-    """Get job status from the Modal Dict."""
+# Progress events are buffered in-process and written to the Modal Dict at most
+# once per interval per job, or immediately when the stage changes. A timer
+# flushes whatever is still buffered once the interval has passed, so the last
+# event of a long stage is not held until the next one. Completion always
+# flushes. Reads go through the local copy first.
+PROGRESS_FLUSH_INTERVAL_SECONDS = 2.0
+# Clean local copies untouched for this long are dropped, so jobs that die
+# without reporting completion don't accumulate on warm containers.
+LOCAL_CACHE_TTL_SECONDS = 15 * 60
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+_local_cache: dict[str, dict] = {}
+_last_flush: dict[str, float] = {}
+_last_stage: dict[str, str] = {}
+_dirty: set[str] = set()
+_flush_timers: dict[str, threading.Timer] = {}
+_lock = threading.RLock()
+
+
+def _read_stored_status(job_id: str) -> dict | None:
     try:
         return job_status_dict.get(job_id)
     except KeyError:
         return None
 
 
+def get_job_status(job_id: str) -> dict | None:
+    """Get job status, preferring this process's unflushed copy.
+
+    Returns a copy; mutating it does not affect buffered state.
+    """
+    with _lock:
+        cached = _local_cache.get(job_id)
+        if cached is not None:
+            return copy.deepcopy(cached)
+    return _read_stored_status(job_id)
+
+
+def _status_for_update(job_id: str, default_status: str) -> dict:
+    """Return the live local status for job_id, loading it from the Dict if needed."""
+    existing = _local_cache.get(job_id)
+    if existing is None:
+        _evict_stale_jobs()
+        existing = _read_stored_status(job_id) or {
+            "job_id": job_id,
+            "status": default_status,
+            "progress": [],
+            "created_at": time.time(),
+        }
+        _local_cache[job_id] = existing
+    return existing
+
+
+def _write_job_status(job_id: str, status: dict) -> None:
+    """Write a job's status to the Modal Dict and mark it clean."""
+    job_status_dict[job_id] = status
+    _last_flush[job_id] = time.time()
+    _dirty.discard(job_id)
+
+
+def _forget_job(job_id: str) -> None:
+    """Drop all local state for a job."""
+    _local_cache.pop(job_id, None)
+    _last_flush.pop(job_id, None)
+    _last_stage.pop(job_id, None)
+    _dirty.discard(job_id)
+    timer = _flush_timers.pop(job_id, None)
+    if timer is not None:
+        timer.cancel()
+
+
+def _evict_stale_jobs() -> None:
+    """Drop clean local copies that haven't been written for a while."""
+    cutoff = time.time() - LOCAL_CACHE_TTL_SECONDS
+    for job_id in [
+        job_id
+        for job_id in _local_cache
+        if job_id not in _dirty and _last_flush.get(job_id, 0.0) < cutoff
+    ]:
+        _forget_job(job_id)
+
+
+def _flush_on_timer(job_id: str) -> None:
+    with _lock:
+        _flush_timers.pop(job_id, None)
+        flush_job_status(job_id)
+
+
+def _schedule_flush(job_id: str, delay: float) -> None:
+    """Make sure buffered progress for job_id is written within delay seconds."""
+    if job_id in _flush_timers:
+        return
+    timer = threading.Timer(delay, _flush_on_timer, args=(job_id,))
+    timer.daemon = True
+    _flush_timers[job_id] = timer
+    timer.start()
+
+
+def flush_job_status(job_id: str | None = None) -> None:
+    """Write buffered progress for one job (or all jobs) to the Modal Dict."""
+    with _lock:
+        job_ids = [job_id] if job_id else list(_dirty)
+        for pending_id in job_ids:
+            if pending_id in _dirty and pending_id in _local_cache:
+                _write_job_status(pending_id, _local_cache[pending_id])
+
+
+atexit.register(flush_job_status)
+
+
 def update_job_status(
     job_id: str,
     status: str,
@@ -28,38 +132,63 @@ def update_job_status(
     usage: dict | None = None,
 ) -> None:
     """Update job status in the Modal Dict."""
-    existing = get_job_status(job_id) or {
-        "job_id": job_id,
-        "status": "pending",
-        "progress": [],
-        "created_at": time.time(),
-    }
+    with _lock:
+        existing = _status_for_update(job_id, "pending")
+
+        existing["status"] = status
+        existing["updated_at"] = time.time()
+
+        if stage and message:
+            existing["progress"].append({
+                "stage": stage,
+                "message": message,
+                "timestamp": time.time(),
+            })
+
+        if output is not None:
+            existing["output"] = output
+        if error is not None:
+            existing["error"] = error
+        if usage is not None:
+            existing["usage"] = usage
+
+        _local_cache[job_id] = existing
+        _write_job_status(job_id, existing)
+        if status in TERMINAL_STATUSES:
+            # The job is finished (or failed); drop the local copy so
+            # long-lived containers don't accumulate state and later reads
+            # see the Dict again.
+            _forget_job(job_id)
+
 
-    existing["status"] = status
-    existing["updated_at"] = time.time()
+def send_progress(job_id: str | None, stage: str, message: str) -> None:
+    """Record a progress update for a job.
 
-    if stage and message:
+    Updates are buffered locally and flushed on a stage change or once
+    PROGRESS_FLUSH_INTERVAL_SECONDS has passed since the last write.
+    """
+    print(f"[{stage}] {message}")
+    if not job_id:
+        return
+    with _lock:
+        existing = _status_for_update(job_id, "pending")
+        now = time.time()
+        existing["status"] = "running"
+        existing["updated_at"] = now
         existing["progress"].append({
             "stage": stage,
             "message": message,
-            "timestamp": time.time(),
+            "timestamp": now,
         })
+        _dirty.add(job_id)
 
-    if output is not None:
-        existing["output"] = output
-    if error is not None:
-        existing["error"] = error
-    if usage is not None:
-        existing["usage"] = usage
-
-    job_status_dict[job_id] = existing
-
-
-def send_progress(job_id: str | None, stage: str, message: str) -> None:
-    """Record a progress update for a job."""
-    print(f"[{stage}] {message}")
-    if job_id:
-        update_job_status(job_id, status="running", stage=stage, message=message)
+        stage_changed = _last_stage.get(job_id) != stage
+        _last_stage[job_id] = stage
+        since_flush = now - _last_flush.get(job_id, 0.0)
+        if stage_changed or since_flush >= PROGRESS_FLUSH_INTERVAL_SECONDS:
+            _write_job_status(job_id, existing)
+        else:
+            _schedule_flush(job_id, PROGRESS_FLUSH_INTERVAL_SECONDS - since_flush)
 
 
 def send_usage_update(
@@ -76,22 +205,19 @@ def send_usage_update(
     if not job_id:
         return
 
-    existing = get_job_status(job_id) or {
-        "job_id": job_id,
-        "status": "running",
-        "progress": [],
-        "created_at": time.time(),
-    }
-
-    # Track cumulative usage with timestamp
-    existing["usage"] = {
-        "gpu_type": gpu_type,
-        "execution_seconds": execution_seconds,
-        "last_updated": time.time(),
-    }
-    existing["updated_at"] = time.time()
-
-    job_status_dict[job_id] = existing
+    with _lock:
+        existing = _status_for_update(job_id, "running")
+
+        # Track cumulative usage with timestamp
+        existing["usage"] = {
+            "gpu_type": gpu_type,
+            "execution_seconds": execution_seconds,
+            "last_updated": time.time(),
+        }
+        existing["updated_at"] = time.time()
+
+        _write_job_status(job_id, existing)
+
     print(f"[usage] {gpu_type}: {execution_seconds:.1f}s elapsed")
 
 
@@ -102,6 +228,7 @@ def send_completion(
     error: str | None = None,
     usage: dict | None = None,
 ) -> None:
-    """Record job completion."""
-    if job_id:
-        update_job_status(job_id, status=status, output=output, error=error, usage=usage)
+    """Record job completion, flushing any buffered progress with it."""
+    if not job_id:
+        return
+    update_job_status(job_id, status=status, output=output, error=error, usage=usage)
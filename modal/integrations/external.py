@@ -13,10 +13,7 @@ class ExternalRepo:
     subdir: str | None = None
 
     def pip_spec(self, package_name: str | None = None) -> str:
-        base = f"git+{self.repo_url}"
-        if self.ref:
-            base = f"{base}@{self.ref}"
+        ref = f"@{self.ref}" if self.ref else ""
         suffix = f"#subdirectory={self.subdir}" if self.subdir else ""
-        if package_name:
-            return f"{package_name} @ {base}{suffix}"
-        return f"{base}{suffix}"
+        spec = f"git+{self.repo_url}{ref}{suffix}"
+        return f"{package_name} @ {spec}" if package_name else spec
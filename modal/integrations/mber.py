@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import csv
+import os
 import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from integrations.external import ExternalRepo
 
@@ -22,6 +23,8 @@ MBER_PROTOCOLS_REPO = ExternalRepo(
     subdir="protocols",
 )
 
+_HOTSPOT_RE = re.compile(r"([A-Za-z])\s*[:\-_/]?\s*(\d+)")
+
 MBER_DEFAULT_MASKED_VHH = (
     "EVQLVESGGGLVQPGGSLRLSCAASG*********WFRQAPGKEREF***********"
     "NADSVKGRFTISRDNAKNTLYLQMNSLRAEDTAVYYC************WGQGTLVTVSS"
@@ -45,7 +48,7 @@ def normalize_mber_hotspots(
     for residue in hotspots:
         if not residue:
             continue
-        match = re.search(r"([A-Za-z])\s*[:\-_/]?\s*(\d+)", residue)
+        match = _HOTSPOT_RE.search(residue)
         if match:
             chain_id, res_id = match.groups()
         elif residue.isdigit() and default_chain:
@@ -71,8 +74,9 @@ def build_vhh_settings(
     skip_pickle: bool,
     skip_png: bool,
 ) -> dict[str, Any]:
-    chains_str = ",".join([chain.strip().upper() for chain in target_chains if chain.strip()])
-    hotspots_str = normalize_mber_hotspots(hotspots, target_chains[0] if target_chains else None)
+    chains = [chain.strip().upper() for chain in target_chains if chain.strip()]
+    chains_str = ",".join(chains)
+    hotspots_str = normalize_mber_hotspots(hotspots, chains[0] if chains else None)
 
     return {
         "output": {
@@ -101,43 +105,107 @@ def build_vhh_settings(
     }
 
 
-def parse_accepted_csv(path: Path) -> list[dict[str, Any]]:
-    if not path.exists():
-        return []
-    results: list[dict[str, Any]] = []
+_ACCEPTED_CSV_FIELDS = (
+    "trajectory_name",
+    "binder_index",
+    "binder_seq",
+    "i_ptm",
+    "plddt",
+    "ptm",
+    "complex_pdb_path",
+    "relaxed_pdb_path",
+)
+
+
+def _iter_accepted_rows(path: Path) -> Iterator[dict[str, Any]]:
     with path.open(newline="") as handle:
-        reader = csv.DictReader(handle)
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if not header:
+            return
+        # Resolve column positions once rather than building a dict per row
+        positions = {name: idx for idx, name in enumerate(header)}
+        indices = [positions.get(field) for field in _ACCEPTED_CSV_FIELDS]
         for row in reader:
-            if not row.get("binder_seq"):
+            width = len(row)
+            (
+                trajectory_name,
+                binder_index,
+                binder_seq,
+                i_ptm,
+                plddt,
+                ptm,
+                complex_pdb_path,
+                relaxed_pdb_path,
+            ) = [row[idx] if idx is not None and idx < width else None for idx in indices]
+            if not binder_seq:
                 continue
-            results.append({
-                "trajectory_name": row.get("trajectory_name"),
-                "binder_index": int(row.get("binder_index") or 0),
-                "binder_seq": row.get("binder_seq"),
-                "i_ptm": float(row.get("i_ptm") or 0.0),
-                "plddt": float(row.get("plddt") or 0.0),
-                "ptm": float(row.get("ptm") or 0.0),
-                "complex_pdb_path": row.get("complex_pdb_path"),
-                "relaxed_pdb_path": row.get("relaxed_pdb_path"),
-            })
-    return results
+            yield {
+                "trajectory_name": trajectory_name,
+                "binder_index": int(binder_index or 0),
+                "binder_seq": binder_seq,
+                "i_ptm": float(i_ptm or 0.0),
+                "plddt": float(plddt or 0.0),
+                "ptm": float(ptm or 0.0),
+                "complex_pdb_path": complex_pdb_path,
+                "relaxed_pdb_path": relaxed_pdb_path,
+            }
+
+
+def parse_accepted_csv(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    return list(_iter_accepted_rows(path))
+
+
+# weights_dir -> its st_mtime_ns when every weight was last found present
+_COMPLETE_WEIGHTS_MTIME: dict[str, int] = {}
 
 
 def check_mber_weights(weights_dir: Path) -> list[str]:
+    # Only a complete result is cached: weights don't disappear on their own,
+    # but a missing file may be added inside a subdirectory without touching
+    # weights_dir's mtime.
+    try:
+        mtime_ns = weights_dir.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+    key = str(weights_dir)
+    if mtime_ns is not None and _COMPLETE_WEIGHTS_MTIME.get(key) == mtime_ns:
+        return []
+    missing = _find_missing_mber_weights(weights_dir)
+    if not missing and mtime_ns is not None:
+        _COMPLETE_WEIGHTS_MTIME[key] = mtime_ns
+    return missing
+
+
+def _dir_entry_names(path: Path) -> set[str]:
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+def _find_missing_mber_weights(weights_dir: Path) -> list[str]:
+    # One directory listing per parent instead of a stat per expected file;
+    # on a cold Volume mount each lookup is a round trip.
     missing: list[str] = []
-    af_check = weights_dir / "af_params" / "params_model_5_ptm.npz"
-    if not af_check.exists():
-        missing.append(str(af_check))
+    af_dir = weights_dir / "af_params"
+    if "params_model_5_ptm.npz" not in _dir_entry_names(af_dir):
+        missing.append(str(af_dir / "params_model_5_ptm.npz"))
     nbb_dir = weights_dir / "nbb2_weights"
+    nbb_names = _dir_entry_names(nbb_dir)
     for model_id in (
         "nanobody_model_1",
         "nanobody_model_2",
         "nanobody_model_3",
         "nanobody_model_4",
     ):
-        if not (nbb_dir / model_id).exists():
+        if model_id not in nbb_names:
             missing.append(str(nbb_dir / model_id))
-    esm_dir = weights_dir / "huggingface" / "hub" / "models--facebook--esm2_t33_650M_UR50D"
-    if not esm_dir.exists():
-        missing.append(str(esm_dir))
+    hub_dir = weights_dir / "huggingface" / "hub"
+    esm_name = "models--facebook--esm2_t33_650M_UR50D"
+    if esm_name not in _dir_entry_names(hub_dir):
+        missing.append(str(hub_dir / esm_name))
     return missing
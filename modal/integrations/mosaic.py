@@ -5,6 +5,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Iterable
 
+import numpy as np
+
 from integrations.external import ExternalRepo
 
 MOSAIC_REPO = ExternalRepo(
@@ -14,6 +16,7 @@ MOSAIC_REPO = ExternalRepo(
 )
 
 MOSAIC_TOKENS = "ARNDCQEGHILKMFPSTWYV"
+_MOSAIC_TOKEN_BYTES = np.frombuffer(MOSAIC_TOKENS.encode("ascii"), dtype=np.uint8)
 MOSAIC_ASSETS_DIR = Path("/assets/mosaic")
 MOSAIC_TRIGRAM_PATH = MOSAIC_ASSETS_DIR / "trigram_seg.pkl"
 
@@ -22,16 +25,34 @@ def pip_specs_for_mosaic() -> list[str]:
     return [MOSAIC_REPO.pip_spec()]
 
 
+def _pad_soft_rows(rows: Iterable[Iterable[float]]) -> np.ndarray:
+    """Stack ragged rows into one matrix, dropping empty rows and padding with -inf."""
+    arrays = [np.asarray(row, dtype=np.float64).ravel() for row in rows]
+    arrays = [row for row in arrays if row.size]
+    width = max((row.size for row in arrays), default=0)
+    padded = np.full((len(arrays), width), -np.inf)
+    for idx, row in enumerate(arrays):
+        padded[idx, : row.size] = row
+    return padded
+
+
 def decode_soft_sequence(soft_sequence: Iterable[Iterable[float]], tokens: str = MOSAIC_TOKENS) -> str:
     """Convert a soft sequence (N x 20) into a hard sequence via argmax."""
-    sequence = []
-    for row in soft_sequence:
-        row_list = list(row)
-        if not row_list:
-            continue
-        max_index = max(range(len(row_list)), key=row_list.__getitem__)
-        sequence.append(tokens[max_index])
-    return "".join(sequence)
+    if not hasattr(soft_sequence, "__len__"):
+        soft_sequence = [list(row) for row in soft_sequence]
+    try:
+        logits = np.asarray(soft_sequence, dtype=np.float64)
+    except (TypeError, ValueError):
+        logits = None
+    if logits is None or logits.ndim != 2:
+        logits = _pad_soft_rows(soft_sequence)
+    if logits.shape[0] == 0 or logits.shape[1] == 0:
+        return ""
+    if tokens == MOSAIC_TOKENS:
+        table = _MOSAIC_TOKEN_BYTES
+    else:
+        table = np.frombuffer(tokens.encode("ascii"), dtype=np.uint8)
+    return table[logits.argmax(axis=1)].tobytes().decode("ascii")
 
 
 def build_trigram_run_metadata(
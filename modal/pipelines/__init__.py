@@ -5,7 +5,7 @@ Pipeline functions for protein design and analysis.
 from pipelines.rfdiffusion3 import run_rfdiffusion3
 from pipelines.boltz2 import run_boltz2
 from pipelines.boltzgen import run_boltzgen
-from pipelines.proteinmpnn import run_proteinmpnn
+from pipelines.proteinmpnn import run_proteinmpnn, run_proteinmpnn_batch
 from pipelines.scoring import compute_scores, run_structure_prediction
 from pipelines.msa import run_msa_search
 
@@ -14,6 +14,7 @@ __all__ = [
     "run_boltz2",
     "run_boltzgen",
     "run_proteinmpnn",
+    "run_proteinmpnn_batch",
     "compute_scores",
     "run_structure_prediction",
     "run_msa_search",
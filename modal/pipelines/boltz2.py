@@ -4,13 +4,12 @@ Boltz-2 structure prediction pipeline.
 
 from __future__ import annotations
 
-import json
 import shlex
-import shutil
 import subprocess
 import tempfile
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from core.config import (
@@ -23,21 +22,29 @@ from core.config import (
     BOLTZ_MODEL_VOLUME,
     BOLTZ_USE_MSA_SERVER,
     BOLTZ_MSA_TIMEOUT_SECONDS,
+    BOLTZ_MSA_BASE_TIMEOUT_SECONDS,
+    BOLTZ_MSA_MIN_TIMEOUT_SECONDS,
+    BOLTZ_MSA_TIMEOUT_PER_RESIDUE,
+    BOLTZ_MSA_TIMEOUT_PER_CHAIN,
     BOLTZ_EXTRA_ARGS,
     RESULTS_PREFIX,
 )
 from core.job_status import send_progress, send_completion
 from utils.boltz_helpers import (
+    _boltz_yaml_payload,
     _clean_sequence,
+    _disable_msa_server,
+    _dump_boltz_yaml,
     _extract_chain_sequences,
+    _extract_chain_sequences_cached,
     _read_boltz_confidence,
     _select_boltz_prediction,
     _select_chain_id,
-    _write_boltz_yaml,
 )
-from utils.ipsae import compute_interface_scores_from_boltz
-from utils.metrics import compute_interface_metrics
-from utils.storage import download_to_path, object_url, upload_bytes, upload_file
+from utils.storage import download_to_path, upload_file, upload_json
+
+# Extra CLI flags are fixed for the process; tokenize them once.
+BOLTZ_EXTRA_ARGV = shlex.split(BOLTZ_EXTRA_ARGS)
 
 
 def ensure_boltz2_cache(cache_dir: Path) -> None:
@@ -49,6 +56,25 @@ def ensure_boltz2_cache(cache_dir: Path) -> None:
         download_boltz2(cache_dir)
 
 
+def msa_timeout_seconds(chain_sequences: list[tuple[str, str]]) -> int:
+    """
+    Scale the MSA server timeout with complex size.
+
+    Large complexes legitimately take longer on the MSA server, while a small
+    complex that has not finished quickly more likely points to a stuck server.
+    An explicit BOLTZ_MSA_TIMEOUT_SECONDS overrides the scaled value.
+    """
+    if BOLTZ_MSA_TIMEOUT_SECONDS is not None:
+        return BOLTZ_MSA_TIMEOUT_SECONDS
+    total_residues = sum(len(sequence) for _, sequence in chain_sequences)
+    timeout = (
+        BOLTZ_MSA_BASE_TIMEOUT_SECONDS
+        + BOLTZ_MSA_TIMEOUT_PER_RESIDUE * total_residues
+        + BOLTZ_MSA_TIMEOUT_PER_CHAIN * len(chain_sequences)
+    )
+    return int(max(BOLTZ_MSA_MIN_TIMEOUT_SECONDS, timeout))
+
+
 def run_boltz_prediction(
     input_path: Path,
     out_dir: Path,
@@ -76,8 +102,7 @@ def run_boltz_prediction(
     ]
     if use_msa_server:
         cmd.append("--use_msa_server")
-    if BOLTZ_EXTRA_ARGS:
-        cmd.extend(shlex.split(BOLTZ_EXTRA_ARGS))
+    cmd.extend(BOLTZ_EXTRA_ARGV)
 
     return subprocess.run(cmd, check=True, timeout=timeout_seconds)
 
@@ -100,10 +125,19 @@ def run_boltz2(
     use_self_hosted_msa: bool = False,
     msa_paths: dict[str, str] | None = None,
     skip_msa_server: bool = False,
+    target_sequences: list[tuple[str, str]] | None = None,
 ) -> dict:
     """
     Boltz-2 structure prediction with optional PAE-based scoring.
+
+    Callers that already parsed the target can pass ``target_sequences`` as
+    (chain_id, sequence) pairs to skip re-extracting them from ``target_pdb``.
     """
+    # Biopython/NumPy-backed scorers are imported on use so loading the app
+    # module (every container, every deploy) doesn't pay for them.
+    from utils.ipsae import compute_interface_scores_from_boltz
+    from utils.metrics import compute_interface_metrics
+
     init_sentry()
     start_time = time.time()
     gpu_type = "A10G"
@@ -115,15 +149,29 @@ def run_boltz2(
 
     with tempfile.TemporaryDirectory() as tmpdir:
         tmpdir_path = Path(tmpdir)
-        target_path = download_to_path(target_pdb, tmpdir_path / "target.pdb")
-
-        target_sequences = _extract_chain_sequences(target_path)
+        binder_seq = ""
+        if not binder_sequences and binder_sequence:
+            binder_seq = _clean_sequence(binder_sequence)
+
+        with ThreadPoolExecutor(max_workers=1) as download_pool:
+            # A binder given only as a structure is fetched while the target
+            # is downloaded and parsed.
+            binder_download = None
+            if not binder_sequences and not binder_seq and binder_pdb:
+                binder_download = download_pool.submit(
+                    download_to_path, binder_pdb, tmpdir_path / "binder.pdb"
+                )
+            if target_sequences:
+                target_sequences = [(chain_id, sequence) for chain_id, sequence in target_sequences]
+            else:
+                target_path = download_to_path(target_pdb, tmpdir_path / "target.pdb")
+                target_sequences = _extract_chain_sequences_cached(target_path)
+            binder_path = binder_download.result() if binder_download else None
         if not target_sequences:
             raise ValueError("No protein chains found in target PDB.")
         target_chain_ids = {chain_id for chain_id, _ in target_sequences}
 
         # Handle binder input - either single sequence or multi-chain sequences
-        binder_seq = ""
         binder_seqs_processed: list[tuple[str, str]] | None = None
         binder_chain_id = None
         binder_chain_ids: list[str] = []
@@ -141,9 +189,7 @@ def run_boltz2(
             print(f"[Boltz2] Multi-chain binder: {len(binder_seqs_processed)} chains with IDs {binder_chain_ids}")
         else:
             # Single-chain binder
-            binder_seq = _clean_sequence(binder_sequence) if binder_sequence else ""
-            if not binder_seq and binder_pdb:
-                binder_path = download_to_path(binder_pdb, tmpdir_path / "binder.pdb")
+            if binder_path:
                 extracted_binder_seqs = _extract_chain_sequences(binder_path)
                 if extracted_binder_seqs:
                     binder_seq = extracted_binder_seqs[0][1]
@@ -163,18 +209,26 @@ def run_boltz2(
         use_msa_server = BOLTZ_USE_MSA_SERVER and not use_self_hosted_msa and not skip_msa_server
         msa_mode_used = "none"
 
+        # Build the input payload once; the fallback only toggles the msa fields
+        boltz_payload = _boltz_yaml_payload(
+            target_sequences=target_sequences,
+            binder_sequence=binder_seq if binder_seq else None,
+            binder_chain_id=binder_chain_id,
+            use_msa_server=use_msa_server,
+            msa_paths=msa_paths,
+            binder_sequences=binder_seqs_processed,
+        )
+        _dump_boltz_yaml(boltz_payload, input_path)
+
         if use_msa_server:
             send_progress(job_id, "boltz2", "Running with MSA server")
 
-            _write_boltz_yaml(
-                target_sequences=target_sequences,
-                binder_sequence=binder_seq if binder_seq else None,
-                binder_chain_id=binder_chain_id,
-                output_path=input_path,
-                use_msa_server=True,
-                msa_paths=msa_paths,
-                binder_sequences=binder_seqs_processed,
-            )
+            if binder_seqs_processed:
+                binder_chains = binder_seqs_processed
+            else:
+                binder_chains = [(binder_chain_id, binder_seq)]
+            msa_timeout = msa_timeout_seconds(target_sequences + binder_chains)
+            print(f"[Boltz2] MSA server timeout: {msa_timeout}s")
 
             try:
                 run_boltz_prediction(
@@ -182,34 +236,29 @@ def run_boltz2(
                     out_dir=out_dir,
                     num_samples=num_samples,
                     use_msa_server=True,
-                    timeout_seconds=BOLTZ_MSA_TIMEOUT_SECONDS,
+                    timeout_seconds=msa_timeout,
                 )
                 msa_mode_used = "public_server"
 
             except subprocess.TimeoutExpired:
-                print(f"MSA server timed out after {BOLTZ_MSA_TIMEOUT_SECONDS}s. Falling back to no MSA...")
+                print(f"MSA server timed out after {msa_timeout}s. Falling back to no MSA...")
                 use_msa_server = False
 
             except subprocess.CalledProcessError as e:
                 print(f"Boltz-2 with MSA server failed: {e}. Falling back to no MSA...")
                 use_msa_server = False
 
+            if not use_msa_server:
+                _dump_boltz_yaml(_disable_msa_server(boltz_payload), input_path)
+
         if not use_msa_server or msa_mode_used == "none":
             if msa_mode_used == "none":
                 send_progress(job_id, "boltz2", "Running without MSA server")
 
-            _write_boltz_yaml(
-                target_sequences=target_sequences,
-                binder_sequence=binder_seq if binder_seq else None,
-                binder_chain_id=binder_chain_id,
-                output_path=input_path,
-                use_msa_server=False,
-                msa_paths=msa_paths,
-                binder_sequences=binder_seqs_processed,
-            )
-
+            # A failed MSA attempt leaves partial output behind; write the retry
+            # to a fresh directory and let the tempdir clean both up at exit.
             if out_dir.exists():
-                shutil.rmtree(out_dir, ignore_errors=True)
+                out_dir = tmpdir_path / "boltz_out_no_msa"
 
             run_boltz_prediction(
                 input_path=input_path,
@@ -241,28 +290,35 @@ def run_boltz2(
         complex_ext = prediction_path.suffix.lower() or ".pdb"
         complex_key = f"{RESULTS_PREFIX}/{job_id}/boltz2_complex{complex_ext}"
         content_type = "chemical/x-mmcif" if complex_ext == ".cif" else "chemical/x-pdb"
-        upload_file(prediction_path, complex_key, content_type=content_type)
-
-        confidence_key = None
-        if confidence:
-            confidence_key = f"{RESULTS_PREFIX}/{job_id}/boltz2_confidence.json"
-            upload_bytes(
-                json.dumps(confidence, indent=2).encode("utf-8"),
-                confidence_key,
-                "application/json",
+        with ThreadPoolExecutor(max_workers=2) as upload_pool:
+            complex_upload = upload_pool.submit(
+                upload_file, prediction_path, complex_key, content_type=content_type
             )
 
-    complex_plddt = confidence.get("complex_plddt") if confidence else None
+            confidence_upload = None
+            if confidence:
+                confidence_key = f"{RESULTS_PREFIX}/{job_id}/boltz2_confidence.json"
+                # Boltz's confidence JSON can hold NaN; keep it as written
+                confidence_upload = upload_pool.submit(
+                    upload_json, confidence, confidence_key, allow_nan=True
+                )
+
+            # Upload helpers return {"key", "url"}; reuse them for the response.
+            complex_ref = complex_upload.result()
+            confidence_ref = confidence_upload.result() if confidence_upload else None
+
+    confidence_values = confidence or {}
+    complex_plddt = confidence_values.get("complex_plddt")
     plddt = round(complex_plddt * 100, 2) if isinstance(complex_plddt, (float, int)) else None
-    iptm_confidence = confidence.get("iptm") if confidence else None
-    ptm = confidence.get("ptm") if confidence else None
+    iptm_confidence = confidence_values.get("iptm")
+    ptm = confidence_values.get("ptm")
 
     boltz_summary = {
         "samples": num_samples,
         "iptm": iptm_confidence,
         "ptm": ptm,
         "plddt": plddt,
-        "confidence_score": confidence.get("confidence_score") if confidence else None,
+        "confidence_score": confidence_values.get("confidence_score"),
         "msa_mode": msa_mode_used,
     }
 
@@ -290,9 +346,9 @@ def run_boltz2(
         "ipsae_scores": ipsae_scores,
         "interface_metrics": distance_metrics,
         "boltz2": {key: value for key, value in boltz_summary.items() if value is not None},
-        "complex": {"key": complex_key, "url": object_url(complex_key)},
-        "structureUrl": object_url(complex_key),
-        "confidence": {"key": confidence_key, "url": object_url(confidence_key)} if confidence_key else None,
+        "complex": complex_ref,
+        "structureUrl": complex_ref["url"],
+        "confidence": confidence_ref,
         "designName": "Boltz-2 prediction",
         "msa_mode": msa_mode_used,
         "usage": {
@@ -4,15 +4,20 @@ BoltzGen binder design pipeline.
 
 from __future__ import annotations
 
+import codecs
 import csv
-import json
 import os
+import re
+import shlex
 import shutil
 import signal
 import subprocess
 import tempfile
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import List
 
@@ -25,6 +30,7 @@ from core.config import (
     sentry_secret,
     init_sentry,
     BOLTZGEN_CACHE_DIR,
+    BOLTZGEN_EXTRA_ARGS,
     BOLTZGEN_MODEL_VOLUME,
     BOLTZGEN_WORK_DIR,
     BOLTZGEN_WORK_VOLUME,
@@ -33,8 +39,58 @@ from core.config import (
 from core.job_status import send_progress, send_completion, send_usage_update
 from pipelines.proteinmpnn import resolve_structure_source
 from utils.boltz_helpers import _extract_chain_sequences
-from utils.pdb import ordered_chain_ids_from_pdb, cif_to_pdb, tail_file, mmcif_auth_label_mapping
-from utils.storage import download_to_path, object_url, upload_bytes, upload_file
+from utils.pdb import (
+    HOTSPOT_RE,
+    ordered_chain_ids_from_pdb,
+    cif_chain_sequences,
+    cif_to_pdb,
+    tail_file,
+    mmcif_auth_label_mapping,
+)
+from utils.storage import (
+    UPLOAD_MAX_WORKERS,
+    download_to_path,
+    object_url,
+    upload_file,
+    upload_json,
+)
+
+# Stage detection patterns for BoltzGen output: (pattern, stage, message).
+# Messages are formatted with num_designs/budget when reported.
+BOLTZGEN_STAGE_PATTERNS = (
+    (r"Running diffusion", "design", "Running diffusion backbone generation"),
+    (r"Diffusion complete|Generated \d+ designs", "design", "Backbone diffusion complete ({num_designs} designs)"),
+    (r"Running inverse folding|ProteinMPNN", "inverse_folding", "Running inverse folding (ProteinMPNN)"),
+    (r"Inverse folding complete", "inverse_folding", "Inverse folding complete"),
+    (r"Running folding|Boltz|boltz", "folding", "Running structure prediction (Boltz-2)"),
+    (r"Folding complete|Predicted \d+ structures", "folding", "Structure prediction complete"),
+    (r"Computing metrics|Analyzing", "analysis", "Computing design metrics"),
+    (r"Filtering|Ranking|Selecting", "filtering", "Filtering and ranking (selecting top {budget})"),
+    (r"Final designs selected|Writing final", "filtering", "Selected {budget} final designs"),
+)
+# One regex matched once per line start. Each branch is a lookahead over the
+# rest of the line followed by an empty named group, and branches are tried in
+# table order, so a line reports the first pattern in the table that it
+# contains (not the leftmost match), as the original per-pattern loop did.
+# match.lastgroup identifies the branch. Like universal newlines, "\r" also
+# ends a line, so each tqdm redraw is scanned on its own.
+BOLTZGEN_STAGE_GROUPS = {
+    f"stage{index}": (stage, message)
+    for index, (_, stage, message) in enumerate(BOLTZGEN_STAGE_PATTERNS)
+}
+BOLTZGEN_STAGE_RE = re.compile(
+    (
+        r"(?:^|(?<=\r))(?:"
+        + "|".join(
+            rf"(?=[^\r\n]*?(?:{pattern}))(?P<stage{index}>)"
+            for index, (pattern, _, _) in enumerate(BOLTZGEN_STAGE_PATTERNS)
+        )
+        + ")"
+    ).encode(),
+    re.IGNORECASE | re.MULTILINE,
+)
+BOLTZGEN_OUTPUT_CHUNK_BYTES = 65536
+BOLTZGEN_EXTRA_ARGV = shlex.split(BOLTZGEN_EXTRA_ARGS)
 
 
 def write_boltzgen_yaml(
@@ -79,7 +135,23 @@ def write_boltzgen_yaml(
 
     spec: dict = {"entities": entities}
 
-    output_path.write_text(yaml.dump(spec, default_flow_style=False))
+    # libyaml's emitter is much faster on long scaffold path lists.
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    output_path.write_text(yaml.dump(spec, Dumper=dumper, default_flow_style=False))
+
+
+BOLTZGEN_SCAFFOLD_DIR = Path("/assets/boltzgen")
+BOLTZGEN_SCAFFOLD_SUBDIRS = {
+    "nanobody": "nanobody_scaffolds",
+    "fab": "fab_scaffolds",
+    "antibody": "fab_scaffolds",
+}
+
+
+@lru_cache(maxsize=4)
+def _scaffold_paths_for_dir(subdir: str) -> tuple[Path, ...]:
+    """List the image-baked scaffold YAMLs in one directory (scanned once)."""
+    return tuple(sorted(_files_with_suffixes(BOLTZGEN_SCAFFOLD_DIR / subdir, (".yaml",))))
 
 
 def resolve_scaffold_paths(scaffold_set: str | None, scaffold_paths: list[str] | None) -> list[Path] | None:
@@ -88,16 +160,13 @@ def resolve_scaffold_paths(scaffold_set: str | None, scaffold_paths: list[str] |
         return [Path(path) for path in scaffold_paths]
     if not scaffold_set:
         return None
-    base_dir = Path("/assets/boltzgen")
-    if scaffold_set == "nanobody":
-        paths = sorted((base_dir / "nanobody_scaffolds").glob("*.yaml"))
-    elif scaffold_set in {"fab", "antibody"}:
-        paths = sorted((base_dir / "fab_scaffolds").glob("*.yaml"))
-    else:
+    subdir = BOLTZGEN_SCAFFOLD_SUBDIRS.get(scaffold_set)
+    if subdir is None:
         raise ValueError(f"Unknown scaffold set: {scaffold_set}")
+    paths = _scaffold_paths_for_dir(subdir)
     if not paths:
         raise ValueError(f"No scaffold YAMLs found for scaffold set: {scaffold_set}")
-    return paths
+    return list(paths)
 
 
 def build_binding_types(
@@ -110,8 +179,6 @@ def build_binding_types(
     if not binding_residues:
         return None
 
-    import re
-
     default_chain = target_chain_ids[0] if target_chain_ids else None
     if not default_chain:
         return None
@@ -123,7 +190,7 @@ def build_binding_types(
     for residue in binding_residues:
         if not residue:
             continue
-        match = re.search(r"([A-Za-z])\s*[:\-_/]?\s*(\d+)", residue)
+        match = HOTSPOT_RE.search(residue)
         if match:
             auth_chain, res_id = match.groups()
         elif residue.isdigit():
@@ -147,53 +214,92 @@ def build_binding_types(
     return binding_types
 
 
+def _find_metrics_csv(output_dir: Path) -> Path | None:
+    """Walk output_dir once for a final_designs_metrics*.csv, else all_designs_metrics.csv."""
+    fallback: Path | None = None
+    stack = [str(output_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.startswith("final_designs_metrics") and entry.name.endswith(".csv"):
+                        return Path(entry.path)
+                    elif fallback is None and entry.name == "all_designs_metrics.csv":
+                        fallback = Path(entry.path)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return fallback
+
+
+def _files_with_suffixes(directory: Path, suffixes: tuple[str, ...]) -> list[Path]:
+    """List files directly in directory whose name ends with one of suffixes."""
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if entry.name.endswith(suffixes) and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _count_files_with_suffixes(directory: Path, suffixes: tuple[str, ...]) -> int:
+    """Count files directly in directory whose name ends with one of suffixes."""
+    try:
+        with os.scandir(directory) as entries:
+            return sum(
+                1 for entry in entries if entry.name.endswith(suffixes) and entry.is_file()
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        return 0
+
+
+def _cif_sequences_via_pdb(cif_path: Path) -> list[tuple[str, str]]:
+    """Convert a CIF to a scratch PDB and read its chain sequences with Biopython."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pdb_path = cif_to_pdb(cif_path, Path(tmpdir) / "design.pdb")
+        return _extract_chain_sequences(pdb_path)
+
+
 def parse_boltzgen_metrics(output_dir: Path, budget: int) -> list[dict]:
-    """Parse BoltzGen output metrics from CSV files."""
-    results = []
+    """Parse the first ``budget`` rows of BoltzGen output metrics.
 
-    # Look for final ranked designs metrics
+    Only the top ``budget`` designs are ever uploaded, so rows past that are
+    not read.
+    """
+    # Look for final ranked designs metrics, then any final/all designs metrics
     final_metrics_path = output_dir / f"final_ranked_designs/final_designs_metrics_{budget}.csv"
     if not final_metrics_path.exists():
-        # Try alternative paths
-        for path in output_dir.glob("**/final_designs_metrics*.csv"):
-            final_metrics_path = path
-            break
-
-    if not final_metrics_path.exists():
-        # Fall back to all_designs_metrics.csv
-        for path in output_dir.glob("**/all_designs_metrics.csv"):
-            final_metrics_path = path
-            break
-
-    if final_metrics_path.exists():
-        with final_metrics_path.open() as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                results.append(dict(row))
+        final_metrics_path = _find_metrics_csv(output_dir)
+    if final_metrics_path is None:
+        return []
 
-    return results
+    with final_metrics_path.open(newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return []
+        return [dict(zip(header, row)) for row in islice(reader, budget)]
 
 
 def find_boltzgen_structures(output_dir: Path, budget: int) -> list[Path]:
     """Find the final designed structure files from BoltzGen output."""
-    structures = []
-
     # Look in final_ranked_designs/final_{budget}_designs/
     final_dir = output_dir / f"final_ranked_designs/final_{budget}_designs"
-    if final_dir.exists():
-        structures = list(final_dir.glob("*.cif")) + list(final_dir.glob("*.pdb"))
+    structures = _files_with_suffixes(final_dir, (".cif", ".pdb"))
 
     # Fallback to intermediate_designs_inverse_folded/refold_cif/
     if not structures:
         refold_dir = output_dir / "intermediate_designs_inverse_folded/refold_cif"
-        if refold_dir.exists():
-            structures = list(refold_dir.glob("*.cif"))[:budget]
+        structures = _files_with_suffixes(refold_dir, (".cif",))
 
     # Fallback to intermediate_designs/
     if not structures:
         intermediate_dir = output_dir / "intermediate_designs"
-        if intermediate_dir.exists():
-            structures = list(intermediate_dir.glob("*.cif"))[:budget]
+        structures = _files_with_suffixes(intermediate_dir, (".cif",))
 
     return sorted(structures)[:budget]
 
@@ -214,8 +320,6 @@ def run_boltzgen_with_progress(
     Parses BoltzGen output to detect pipeline stages and sends progress updates.
     Also monitors output directories to report design-level progress.
     """
-    import re
-    import select
     import sys
     import threading
 
@@ -226,21 +330,9 @@ def run_boltzgen_with_progress(
             output_dir = Path(cmd[i + 1])
             break
 
-    # Stage detection patterns for BoltzGen output
-    stage_patterns = [
-        (r"Running diffusion", "design", "Running diffusion backbone generation"),
-        (r"Diffusion complete|Generated \d+ designs", "design", f"Backbone diffusion complete ({num_designs} designs)"),
-        (r"Running inverse folding|ProteinMPNN", "inverse_folding", "Running inverse folding (ProteinMPNN)"),
-        (r"Inverse folding complete", "inverse_folding", "Inverse folding complete"),
-        (r"Running folding|Boltz|boltz", "folding", "Running structure prediction (Boltz-2)"),
-        (r"Folding complete|Predicted \d+ structures", "folding", "Structure prediction complete"),
-        (r"Computing metrics|Analyzing", "analysis", "Computing design metrics"),
-        (r"Filtering|Ranking|Selecting", "filtering", f"Filtering and ranking (selecting top {budget})"),
-        (r"Final designs selected|Writing final", "filtering", f"Selected {budget} final designs"),
-    ]
-
     # Track which stages we've reported
     reported_stages = set()
+    stage_message_count = len(set(BOLTZGEN_STAGE_GROUPS.values()))
     last_progress_time = time.time()
     last_design_counts: dict[str, int] = {}
     stop_progress_monitor = threading.Event()
@@ -252,19 +344,17 @@ def run_boltzgen_with_progress(
 
         # Check stages in order of pipeline progression
         stages = [
-            ("design", "intermediate_designs", "*.cif", num_designs),
-            ("inverse_folding", "intermediate_designs_inverse_folded", "*.cif", num_designs),
-            ("folding", "intermediate_designs_inverse_folded/refold_cif", "*.cif", num_designs),
-            ("filtering", f"final_ranked_designs/final_{budget}_designs", "*.cif", budget),
+            ("design", "intermediate_designs", num_designs),
+            ("inverse_folding", "intermediate_designs_inverse_folded", num_designs),
+            ("folding", "intermediate_designs_inverse_folded/refold_cif", num_designs),
+            ("filtering", f"final_ranked_designs/final_{budget}_designs", budget),
         ]
 
         # Find the most recent active stage
-        for stage_name, subdir, pattern, total in reversed(stages):
-            stage_dir = output_dir / subdir
-            if stage_dir.exists():
-                count = len(list(stage_dir.glob(pattern)))
-                if count > 0:
-                    return (stage_name, count, total)
+        for stage_name, subdir, total in reversed(stages):
+            count = _count_files_with_suffixes(output_dir / subdir, (".cif",))
+            if count > 0:
+                return (stage_name, count, total)
 
         return None
 
@@ -294,19 +384,21 @@ def run_boltzgen_with_progress(
             except Exception as e:
                 print(f"[progress_monitor] Error: {e}")
 
-    def check_line_for_progress(line: str) -> None:
-        """Check a log line for progress indicators and send updates."""
+    def check_output_for_progress(data: bytes) -> None:
+        """Check complete log lines for progress indicators and send updates."""
         nonlocal last_progress_time
 
-        for pattern, stage, message in stage_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
+        # Each stage message is reported once, so once all of them have been
+        # seen the rest of the output only needs the heartbeat check.
+        if len(reported_stages) < stage_message_count:
+            for match in BOLTZGEN_STAGE_RE.finditer(data):
+                stage, message = BOLTZGEN_STAGE_GROUPS[match.lastgroup]
                 # Only report each stage once (or if message differs)
                 stage_key = f"{stage}:{message}"
                 if stage_key not in reported_stages:
                     reported_stages.add(stage_key)
-                    send_progress(job_id, stage, message)
+                    send_progress(job_id, stage, message.format(num_designs=num_designs, budget=budget))
                     last_progress_time = time.time()
-                break
 
         # Send periodic heartbeat if no progress for a while (every 60s)
         if time.time() - last_progress_time > 60:
@@ -317,31 +409,42 @@ def run_boltzgen_with_progress(
     monitor_thread = threading.Thread(target=progress_monitor, daemon=True)
     monitor_thread.start()
 
-    # Run subprocess with real-time output streaming
+    # Run subprocess with real-time output streaming. Output is read in raw
+    # chunks rather than line by line: bytes go straight to the log, Modal logs
+    # get an incremental decode, and only complete lines are scanned for stages.
     process = subprocess.Popen(
         cmd,
         env=env,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,  # Line buffered
+        bufsize=0,
     )
+    stdout_fd = process.stdout.fileno()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = bytearray()
 
-    with log_path.open("w", encoding="utf-8") as log_handle:
+    with log_path.open("wb") as log_handle:
         try:
-            for line in process.stdout:
-                # Write to log file
-                log_handle.write(line)
-                log_handle.flush()
-
-                # Print to Modal logs
-                print(line, end="", file=sys.stdout)
-
-                # Check for progress indicators
-                check_line_for_progress(line)
+            while True:
+                chunk = os.read(stdout_fd, BOLTZGEN_OUTPUT_CHUNK_BYTES)
+                if not chunk:
+                    break
+                log_handle.write(chunk)
+                sys.stdout.write(decoder.decode(chunk))
+                sys.stdout.flush()
+
+                pending += chunk
+                cut = max(pending.rfind(b"\n"), pending.rfind(b"\r")) + 1
+                if cut:
+                    check_output_for_progress(pending[:cut])
+                    del pending[:cut]
+            if pending:
+                check_output_for_progress(pending)
+            sys.stdout.write(decoder.decode(b"", final=True))
 
             # Wait for process to complete
             return_code = process.wait()
+            log_handle.flush()
 
             if return_code != 0:
                 tail = tail_file(log_path, max_bytes=8000)
@@ -460,21 +563,21 @@ def run_boltzgen(
     else:
         send_progress(job_id, "init", "Using cached target structure")
 
+    # Map auth -> label ids once; CIF targets need it for chains and binding sites
+    residue_map: dict[tuple[str, str], tuple[str, str]] = {}
+    chain_map: dict[str, str] = {}
+    if target_path.suffix.lower() == ".cif":
+        residue_map, chain_map = mmcif_auth_label_mapping(target_path)
+
     # Determine target chains if not specified
     if not target_chain_ids:
         if target_path.suffix.lower() == ".cif":
-            _, chain_map = mmcif_auth_label_mapping(target_path)
-            target_chain_ids = list(dict.fromkeys(chain_map.keys()))
+            target_chain_ids = list(chain_map)
         else:
             target_chain_ids = ordered_chain_ids_from_pdb(target_path)
     if not target_chain_ids:
         raise ValueError("No protein chains found in target structure.")
 
-    residue_map: dict[tuple[str, str], tuple[str, str]] = {}
-    chain_map: dict[str, str] = {}
-    if target_path.suffix.lower() == ".cif":
-        residue_map, chain_map = mmcif_auth_label_mapping(target_path)
-
     mapped_chain_ids = [chain_map.get(chain_id, chain_id) for chain_id in target_chain_ids]
     binding_types = build_binding_types(binding_residues, target_chain_ids, residue_map, chain_map)
     scaffold_paths_resolved = resolve_scaffold_paths(scaffold_set, scaffold_paths)
@@ -505,40 +608,32 @@ def run_boltzgen(
         "--reuse",  # Always enable for preemption recovery
     ]
 
-    # Add optional parameters
-    if diffusion_batch_size:
-        cmd.extend(["--diffusion_batch_size", str(diffusion_batch_size)])
-    if step_scale is not None:
-        cmd.extend(["--step_scale", str(step_scale)])
-    if noise_scale is not None:
-        cmd.extend(["--noise_scale", str(noise_scale)])
-    if inverse_fold_num_sequences != 1:
-        cmd.extend(["--inverse_fold_num_sequences", str(inverse_fold_num_sequences)])
-    if inverse_fold_avoid:
-        cmd.extend(["--inverse_fold_avoid", inverse_fold_avoid])
+    # Add optional parameters; a None value leaves the flag at BoltzGen's default
+    optional_args = (
+        ("--diffusion_batch_size", diffusion_batch_size or None),
+        ("--step_scale", step_scale),
+        ("--noise_scale", noise_scale),
+        ("--inverse_fold_num_sequences", inverse_fold_num_sequences if inverse_fold_num_sequences != 1 else None),
+        ("--inverse_fold_avoid", inverse_fold_avoid or None),
+        ("--filter_biased", None if filter_biased else "false"),
+        ("--refolding_rmsd_threshold", refolding_rmsd_threshold),
+        ("--metrics_override", metrics_override or None),
+        ("--devices", devices or None),
+        ("--steps", ",".join(steps) if steps else None),
+    )
+    cmd += [arg for flag, value in optional_args if value is not None for arg in (flag, str(value))]
     if skip_inverse_folding:
         cmd.append("--skip_inverse_folding")
-    if not filter_biased:
-        cmd.extend(["--filter_biased", "false"])
-    if refolding_rmsd_threshold is not None:
-        cmd.extend(["--refolding_rmsd_threshold", str(refolding_rmsd_threshold)])
-    if metrics_override:
-        cmd.extend(["--metrics_override", metrics_override])
-    if additional_filters:
-        for filt in additional_filters:
-            cmd.extend(["--additional_filters", filt])
-    if devices:
-        cmd.extend(["--devices", str(devices)])
-    if steps:
-        cmd.extend(["--steps", ",".join(steps)])
+    for filt in additional_filters or ():
+        cmd += ("--additional_filters", filt)
+    cmd.extend(BOLTZGEN_EXTRA_ARGV)
 
     # Run BoltzGen with progress streaming
     log_path = work_dir / "boltzgen_run.log"
-    env = os.environ.copy()
-    env["BOLTZGEN_CACHE"] = BOLTZGEN_CACHE_DIR
+    env = {**os.environ, "BOLTZGEN_CACHE": BOLTZGEN_CACHE_DIR}
 
     resume_msg = " (resuming)" if is_resuming else ""
-    print(f"Running BoltzGen{resume_msg}: {' '.join(cmd)}")
+    print(f"Running BoltzGen{resume_msg}: {shlex.join(cmd)}")
     send_progress(job_id, "design", f"{'Resuming' if is_resuming else 'Starting'} BoltzGen ({num_designs} designs, budget {budget})")
 
     try:
@@ -567,50 +662,62 @@ def run_boltzgen(
 
     # Upload results and build manifest
     designs: List[dict] = []
-    for idx, struct_path in enumerate(structure_paths):
-        # Upload structure
-        struct_ext = struct_path.suffix.lower() or ".cif"
-        struct_key = f"{RESULTS_PREFIX}/{job_id}/design_{idx}{struct_ext}"
-        content_type = "chemical/x-mmcif" if struct_ext == ".cif" else "chemical/x-pdb"
-        upload_file(struct_path, struct_key, content_type=content_type)
-
-        # Extract sequence from structure
-        if struct_ext == ".cif":
-            # Convert CIF to PDB for sequence extraction
-            pdb_path = work_dir / f"design_{idx}.pdb"
-            cif_to_pdb(struct_path, pdb_path)
-            sequences = _extract_chain_sequences(pdb_path)
-        else:
-            sequences = _extract_chain_sequences(struct_path)
-
-        # Get metrics for this design if available
-        design_metrics = {}
-        if idx < len(metrics_data):
-            design_metrics = metrics_data[idx]
-
-        designs.append({
-            "design_id": f"{job_id}-d{idx}",
-            "structure": {"key": struct_key, "url": object_url(struct_key)},
-            "sequences": [
-                {"chain_id": chain_id, "sequence": seq}
-                for chain_id, seq in sequences
-            ],
-            "metrics": design_metrics,
-        })
-
-    # Upload full metrics CSV if available
-    metrics_key = None
-    final_metrics_path = output_dir / "final_ranked_designs/all_designs_metrics.csv"
-    if final_metrics_path.exists():
-        metrics_key = f"{RESULTS_PREFIX}/{job_id}/all_designs_metrics.csv"
-        upload_file(final_metrics_path, metrics_key, content_type="text/csv")
-
-    # Upload overview PDF if available
-    overview_key = None
-    overview_path = output_dir / "final_ranked_designs/results_overview.pdf"
-    if overview_path.exists():
-        overview_key = f"{RESULTS_PREFIX}/{job_id}/results_overview.pdf"
-        upload_file(overview_path, overview_key, content_type="application/pdf")
+    upload_futures = []
+    with ThreadPoolExecutor(max_workers=UPLOAD_MAX_WORKERS) as upload_pool:
+        for idx, struct_path in enumerate(structure_paths):
+            # Upload structure
+            struct_ext = struct_path.suffix.lower() or ".cif"
+            struct_key = f"{RESULTS_PREFIX}/{job_id}/design_{idx}{struct_ext}"
+            content_type = "chemical/x-mmcif" if struct_ext == ".cif" else "chemical/x-pdb"
+            upload_futures.append(
+                upload_pool.submit(upload_file, struct_path, struct_key, content_type=content_type)
+            )
+
+            # Extract sequence from structure
+            if struct_ext == ".cif":
+                # Read straight from the CIF with gemmi; no intermediate PDB
+                sequences = cif_chain_sequences(struct_path) or _cif_sequences_via_pdb(struct_path)
+            else:
+                sequences = _extract_chain_sequences(struct_path)
+
+            # Get metrics for this design if available
+            design_metrics = {}
+            if idx < len(metrics_data):
+                design_metrics = metrics_data[idx]
+
+            designs.append({
+                "design_id": f"{job_id}-d{idx}",
+                "structure": {"key": struct_key, "url": object_url(struct_key)},
+                "sequences": [
+                    {"chain_id": chain_id, "sequence": seq}
+                    for chain_id, seq in sequences
+                ],
+                "metrics": design_metrics,
+            })
+
+        # Upload full metrics CSV if available
+        metrics_future = None
+        final_metrics_path = output_dir / "final_ranked_designs/all_designs_metrics.csv"
+        if final_metrics_path.exists():
+            metrics_key = f"{RESULTS_PREFIX}/{job_id}/all_designs_metrics.csv"
+            metrics_future = upload_pool.submit(
+                upload_file, final_metrics_path, metrics_key, content_type="text/csv"
+            )
+
+        # Upload overview PDF if available
+        overview_future = None
+        overview_path = output_dir / "final_ranked_designs/results_overview.pdf"
+        if overview_path.exists():
+            overview_key = f"{RESULTS_PREFIX}/{job_id}/results_overview.pdf"
+            overview_future = upload_pool.submit(
+                upload_file, overview_path, overview_key, content_type="application/pdf"
+            )
+
+        for future in upload_futures:
+            future.result()
+        # upload_file returns {"key", "url"}; reuse those refs in the output
+        metrics_ref = metrics_future.result() if metrics_future else None
+        overview_ref = overview_future.result() if overview_future else None
 
     manifest = {
         "job_id": job_id,
@@ -631,7 +738,7 @@ def run_boltzgen(
         "designs": designs,
     }
     manifest_key = f"{RESULTS_PREFIX}/{job_id}/manifest.json"
-    upload_bytes(json.dumps(manifest, indent=2).encode("utf-8"), manifest_key, "application/json")
+    manifest_ref = upload_json(manifest, manifest_key)
 
     execution_seconds = round(time.time() - start_time, 2)
 
@@ -641,10 +748,10 @@ def run_boltzgen(
         "status": "completed",
         "job_id": job_id,
         "challenge_id": challenge_id,
-        "manifest": {"key": manifest_key, "url": object_url(manifest_key)},
+        "manifest": manifest_ref,
         "designs": designs,
-        "metrics_csv": {"key": metrics_key, "url": object_url(metrics_key)} if metrics_key else None,
-        "overview_pdf": {"key": overview_key, "url": object_url(overview_key)} if overview_key else None,
+        "metrics_csv": metrics_ref,
+        "overview_pdf": overview_ref,
         "pipeline": "boltzgen",
         "protocol": protocol,
         "parameters": {
@@ -4,6 +4,7 @@ ProteinMPNN pipeline for sequence design from backbones.
 
 from __future__ import annotations
 
+import hashlib
 import math
 import re
 import subprocess
@@ -28,6 +29,8 @@ from core.config import (
 from utils.storage import download_to_path
 from utils.pdb import estimate_backbone_length
 
+_SCORE_RE = re.compile(r"score=([0-9.]+)")
+
 
 def rng_from_job(job_id: str | None) -> random.Random:
     """Create a seeded random generator from a job ID."""
@@ -37,30 +40,24 @@ def rng_from_job(job_id: str | None) -> random.Random:
         job_uuid = uuid.UUID(job_id)
         seed = job_uuid.int % (2**32 - 1)
     except ValueError:
-        seed = sum(ord(c) for c in job_id)
+        digest = hashlib.blake2b(job_id.encode("utf-8"), digest_size=8).digest()
+        seed = int.from_bytes(digest, "little") % (2**32 - 1)
     return random.Random(seed)
 
 
 def parse_mpnn_fasta(path: Path) -> List[dict]:
     """Parse ProteinMPNN output FASTA file."""
     sequences: List[dict] = []
-    header = None
-    buffer: List[str] = []
-    for line in path.read_text().splitlines():
-        line = line.strip()
-        if not line:
+    # Splitting on line-leading ">" keeps record scanning in C; the first
+    # chunk is whatever precedes the first header and is discarded.
+    records = ("\n" + path.read_text()).split("\n>")
+    for record in records[1:]:
+        header, _, body = record.partition("\n")
+        header = header.strip()
+        sequence = "".join(body.split())
+        if not header or not sequence:
             continue
-        if line.startswith(">"):
-            if header and buffer:
-                entry = mpnn_entry_from_record(header, "".join(buffer))
-                if entry:
-                    sequences.append(entry)
-            header = line[1:]
-            buffer = []
-        else:
-            buffer.append(line)
-    if header and buffer:
-        entry = mpnn_entry_from_record(header, "".join(buffer))
+        entry = mpnn_entry_from_record(header, sequence)
         if entry:
             sequences.append(entry)
     return sequences
@@ -68,7 +65,7 @@ def parse_mpnn_fasta(path: Path) -> List[dict]:
 
 def mpnn_entry_from_record(header: str, sequence: str) -> dict | None:
     """Parse a single ProteinMPNN FASTA record."""
-    score_match = re.search(r"score=([0-9.]+)", header)
+    score_match = _SCORE_RE.search(header)
     score = float(score_match.group(1)) if score_match else None
     entry = {"sequence": sequence}
     if score is not None:
@@ -77,6 +74,35 @@ def mpnn_entry_from_record(header: str, sequence: str) -> dict | None:
     return entry
 
 
+def _mpnn_sampling_args(num_sequences: int, seed: int | None) -> tuple[int, List[str]]:
+    """Build the sampling arguments shared by single and batched MPNN runs."""
+    num_sequences = max(int(num_sequences), 1)
+    # protein_mpnn_run.py samples num_seq_per_target // batch_size full batches,
+    # so the total must be a batch multiple. Keep the minimum number of batches
+    # but spread the sequences evenly across them, so at most n_batches - 1
+    # extra sequences are sampled (e.g. 9 -> 2x5 rather than 2x8).
+    n_batches = math.ceil(num_sequences / max(1, PROTEINMPNN_BATCH_SIZE))
+    batch_size = math.ceil(num_sequences / n_batches)
+    adjusted_num = batch_size * n_batches
+    args = [
+        "--num_seq_per_target",
+        str(adjusted_num),
+        "--batch_size",
+        str(batch_size),
+        "--sampling_temp",
+        PROTEINMPNN_SAMPLING_TEMP,
+        "--model_name",
+        PROTEINMPNN_MODEL_NAME,
+        "--path_to_model_weights",
+        str(PROTEINMPNN_DIR / "vanilla_model_weights"),
+        "--suppress_print",
+        "1",
+    ]
+    if seed is not None:
+        args.extend(["--seed", str(seed)])
+    return num_sequences, args
+
+
 def run_proteinmpnn_local(
     backbone_path: Path,
     output_dir: Path,
@@ -86,9 +112,7 @@ def run_proteinmpnn_local(
 ) -> List[dict]:
     """Run ProteinMPNN locally on a backbone structure."""
     output_dir.mkdir(parents=True, exist_ok=True)
-    num_sequences = max(int(num_sequences), 1)
-    batch_size = max(1, min(PROTEINMPNN_BATCH_SIZE, num_sequences))
-    adjusted_num = batch_size * math.ceil(num_sequences / batch_size)
+    num_sequences, sampling_args = _mpnn_sampling_args(num_sequences, seed)
 
     args = [
         "python",
@@ -97,21 +121,8 @@ def run_proteinmpnn_local(
         str(backbone_path),
         "--out_folder",
         str(output_dir),
-        "--num_seq_per_target",
-        str(adjusted_num),
-        "--batch_size",
-        str(batch_size),
-        "--sampling_temp",
-        PROTEINMPNN_SAMPLING_TEMP,
-        "--model_name",
-        PROTEINMPNN_MODEL_NAME,
-        "--path_to_model_weights",
-        str(PROTEINMPNN_DIR / "vanilla_model_weights"),
-        "--suppress_print",
-        "1",
+        *sampling_args,
     ]
-    if seed is not None:
-        args.extend(["--seed", str(seed)])
     if design_chains:
         args.extend(["--pdb_path_chains", " ".join(design_chains)])
 
@@ -124,6 +135,83 @@ def run_proteinmpnn_local(
     return sequences[:num_sequences]
 
 
+def run_proteinmpnn_batch_local(
+    backbone_paths: List[Path],
+    output_dir: Path,
+    num_sequences: int,
+    design_chains: List[str] | None = None,
+    seed: int | None = None,
+) -> List[List[dict]]:
+    """Run ProteinMPNN once over several backbones.
+
+    The backbones are parsed into a single JSONL with MPNN's multi-chain
+    helper so the model is loaded once for the whole batch. Returns one
+    sequence list per input backbone, in input order.
+    """
+    if not backbone_paths:
+        return []
+    output_dir.mkdir(parents=True, exist_ok=True)
+    num_sequences, sampling_args = _mpnn_sampling_args(num_sequences, seed)
+
+    pdb_dir = output_dir / "backbones"
+    pdb_dir.mkdir(parents=True, exist_ok=True)
+    names: List[str] = []
+    for idx, backbone_path in enumerate(backbone_paths):
+        name = f"backbone_{idx}"
+        (pdb_dir / f"{name}.pdb").write_bytes(backbone_path.read_bytes())
+        names.append(name)
+
+    parsed_path = output_dir / "parsed_pdbs.jsonl"
+    subprocess.run(
+        [
+            "python",
+            str(PROTEINMPNN_DIR / "helper_scripts" / "parse_multiple_chains.py"),
+            "--input_path",
+            f"{pdb_dir}/",  # the helper globs input_path + "*.pdb"
+            "--output_path",
+            str(parsed_path),
+        ],
+        check=True,
+        cwd=str(PROTEINMPNN_DIR),
+    )
+
+    args = [
+        "python",
+        str(PROTEINMPNN_DIR / "protein_mpnn_run.py"),
+        "--jsonl_path",
+        str(parsed_path),
+        "--out_folder",
+        str(output_dir),
+        *sampling_args,
+    ]
+    if design_chains:
+        assigned_path = output_dir / "assigned_chains.jsonl"
+        subprocess.run(
+            [
+                "python",
+                str(PROTEINMPNN_DIR / "helper_scripts" / "assign_fixed_chains.py"),
+                "--input_path",
+                str(parsed_path),
+                "--output_path",
+                str(assigned_path),
+                "--chain_list",
+                " ".join(design_chains),
+            ],
+            check=True,
+            cwd=str(PROTEINMPNN_DIR),
+        )
+        args.extend(["--chain_id_jsonl", str(assigned_path)])
+
+    subprocess.run(args, check=True, cwd=str(PROTEINMPNN_DIR))
+
+    results: List[List[dict]] = []
+    for name in names:
+        fasta_path = output_dir / "seqs" / f"{name}.fa"
+        sequences = parse_mpnn_fasta(fasta_path) if fasta_path.exists() else []
+        results.append(sequences[:num_sequences])
+    return results
+
+
 def resolve_structure_source(target_pdb: str | None, target_structure_url: str | None) -> str:
     """Resolve structure source from PDB content or URL."""
     if target_pdb:
@@ -171,3 +259,47 @@ def run_proteinmpnn(
             "execution_seconds": execution_seconds,
         },
     }
+
+
+@app.function(image=proteinmpnn_image, gpu="A10G", timeout=3600, secrets=[r2_secret, sentry_secret])
+def run_proteinmpnn_batch(
+    backbone_pdbs: List[str],
+    num_sequences: int = 4,
+    job_id: str | None = None,
+) -> dict:
+    """ProteinMPNN over several backbones in a single model invocation."""
+    init_sentry()
+    start_time = time.time()
+    gpu_type = "A10G"
+
+    job_id = job_id or str(uuid.uuid4())
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+        backbone_paths = [
+            download_to_path(source, tmpdir_path / "inputs" / f"backbone_{idx}.pdb")
+            for idx, source in enumerate(backbone_pdbs)
+        ]
+        estimated_lengths = [estimate_backbone_length(path) for path in backbone_paths]
+        batch_sequences = run_proteinmpnn_batch_local(
+            backbone_paths=backbone_paths,
+            output_dir=tmpdir_path / "mpnn",
+            num_sequences=num_sequences,
+            seed=rng_from_job(job_id).randint(1, 10_000_000),
+        )
+
+    execution_seconds = round(time.time() - start_time, 2)
+
+    return {
+        "status": "completed",
+        "job_id": job_id,
+        "results": [
+            {"sequences": sequences, "backbone_length": length}
+            for sequences, length in zip(batch_sequences, estimated_lengths)
+        ],
+        "mode": "inference",
+        "usage": {
+            "gpu_type": gpu_type,
+            "execution_seconds": execution_seconds,
+        },
+    }
@@ -7,14 +7,16 @@ from __future__ import annotations
 import json
 import math
 import os
-import re
 import shlex
 import subprocess
+import sys
 import tempfile
 import time
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Iterable, List
 import random
 
 from core.config import (
@@ -33,24 +35,34 @@ from core.config import (
     RESULTS_PREFIX,
 )
 from core.job_status import send_progress, send_completion
-from pipelines.proteinmpnn import run_proteinmpnn, rng_from_job, resolve_structure_source
+from pipelines.proteinmpnn import run_proteinmpnn_batch, rng_from_job, resolve_structure_source
 from pipelines.boltz2 import run_boltz2
 from utils.boltz_helpers import _extract_chain_sequences
-from utils.metrics import chain_ids_from_structure, compute_interface_metrics
 from utils.rfd3_shim import RMSNORM_SHIM, ensure_rmsnorm
-from utils.storage import download_to_path, object_url, upload_bytes, upload_file
+from utils.storage import (
+    UPLOAD_MAX_WORKERS,
+    download_to_path,
+    object_url,
+    upload_file,
+    upload_json,
+)
 from utils.pdb import (
-    chain_residue_segments_from_pdb,
-    ordered_chain_ids_from_pdb,
+    HOTSPOT_RE,
+    parse_pdb_ca,
     write_pdb_chains,
-    cif_to_pdb,
+    cif_to_pdb_with_chains,
     match_output_target_chains,
-    tail_file,
 )
 
 
 CURRENT_DIR = Path(__file__).resolve().parent.parent
 
+# Bounded in-memory tail of the RFD3 subprocess output used for error reports
+RFD3_LOG_TAIL_LINES = 400
+RFD3_ERROR_CONTEXT_LINES = 60
+
+RFD3_EXTRA_ARGV = shlex.split(RFD3_EXTRA_ARGS)
+
 
 def rfd3_hotspot_selection(
     hotspots: list[str] | None,
@@ -65,7 +77,7 @@ def rfd3_hotspot_selection(
     for residue in hotspots:
         if not residue:
             continue
-        match = re.search(r"([A-Za-z])\s*[:\-_/]?\s*(\d+)", residue)
+        match = HOTSPOT_RE.search(residue)
         if match:
             chain_id, res_id = match.groups()
         elif residue.isdigit():
@@ -110,22 +122,43 @@ def rfd3_contig_string(
 
 
 def ensure_rfd3_models(models_dir: Path) -> None:
-    """Ensure RFD3 model weights are downloaded."""
+    """Ensure RFD3 model weights are downloaded to the model volume."""
     models_dir.mkdir(parents=True, exist_ok=True)
-    checkpoint_path = models_dir / RFD3_CHECKPOINT_FILENAME
-    if checkpoint_path.exists():
+    marker = models_dir / ".rfd3_complete"
+    if marker.exists():
+        return
+    # Volumes populated before the marker existed: accept only the configured
+    # checkpoint, and only if it is non-empty.
+    checkpoint = models_dir / RFD3_CHECKPOINT_FILENAME
+    if checkpoint.is_file() and checkpoint.stat().st_size > 0:
         return
-    subprocess.run(
+    print("Downloading RFD3 weights...")
+    result = subprocess.run(
         ["foundry", "install", "rfd3", "--checkpoint-dir", str(models_dir)],
-        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
     )
+    if result.returncode != 0:
+        tail = (result.stderr or "")[-4000:]
+        raise RuntimeError(f"foundry install rfd3 failed with exit code {result.returncode}:\n{tail}")
+    marker.touch()
+    # Persist the weights so other containers skip the download
+    RFD3_MODEL_VOLUME.commit()
+
+
+def _cancel_calls(calls: Iterable) -> None:
+    """Best-effort cancel of spawned Modal function calls."""
+    for call in calls:
+        try:
+            call.cancel()
+        except Exception as exc:
+            print(f"Failed to cancel function call: {exc}")
 
 
-def extract_rfd3_error(log_path: Path) -> str:
-    """Extract relevant error message from RFD3 log."""
-    if not log_path.exists():
-        return ""
-    text = log_path.read_text(errors="replace")
+def extract_rfd3_error(lines: Iterable[str]) -> str:
+    """Extract relevant error message from the tail of the RFD3 output."""
+    lines = list(lines)
     for token in (
         "OutOfMemoryError",
         "CUDA out of memory",
@@ -136,11 +169,11 @@ def extract_rfd3_error(log_path: Path) -> str:
         "InstantiationException",
         "Traceback",
     ):
-        idx = text.rfind(token)
-        if idx != -1:
-            start = max(0, idx - 4000)
-            return text[start:]
-    return tail_file(log_path)
+        for idx in range(len(lines) - 1, -1, -1):
+            if token in lines[idx]:
+                start = max(0, idx - RFD3_ERROR_CONTEXT_LINES)
+                return "".join(lines[start:])
+    return "".join(lines)
 
 
 @app.function(
@@ -168,6 +201,8 @@ def run_rfdiffusion3(
     """
     RFdiffusion3 (RFD3) + ProteinMPNN + Boltz-2 pipeline for binder design.
     """
+    from utils.metrics import compute_interface_metrics
+
     init_sentry()
     start_time = time.time()
     gpu_type = "A10G"
@@ -190,10 +225,9 @@ def run_rfdiffusion3(
         else:
             target_path = raw_target_path
 
-        chain_segments = chain_residue_segments_from_pdb(target_path)
+        _, _, chain_segments, ordered_chains = parse_pdb_ca(target_path)
         if not chain_segments:
             raise ValueError("Target PDB does not contain any protein chains.")
-        ordered_chains = ordered_chain_ids_from_pdb(target_path)
         pdb_chain_ids = set(chain_segments.keys())
         default_chain_id = next(
             (chain_id for chain_id in ordered_chains if chain_id in pdb_chain_ids),
@@ -256,8 +290,7 @@ def run_rfdiffusion3(
             cmd.append(f"inference_sampler.num_timesteps={int(diffusion_steps)}")
         if RFD3_LOW_MEMORY_MODE:
             cmd.append("low_memory_mode=True")
-        if RFD3_EXTRA_ARGS:
-            cmd.extend(shlex.split(RFD3_EXTRA_ARGS))
+        cmd.extend(RFD3_EXTRA_ARGV)
 
         shim_path = tmpdir_path / "sitecustomize.py"
         shim_path.write_text(RMSNORM_SHIM)
@@ -273,12 +306,29 @@ def run_rfdiffusion3(
         send_progress(job_id, "rfdiffusion", f"Running RFdiffusion3 ({num_designs} designs, {diffusion_steps} steps)")
 
         log_path = tmpdir_path / "rfd3_run.log"
-        with log_path.open("w", encoding="utf-8") as log_handle:
+        log_tail: deque[str] = deque(maxlen=RFD3_LOG_TAIL_LINES)
+        # Popen's context exit closes the pipe and reaps the child, including
+        # after the kill below.
+        with subprocess.Popen(
+            cmd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,  # Line buffered
+        ) as process, log_path.open("w", encoding="utf-8") as log_handle:
             try:
-                subprocess.run(cmd, check=True, env=env, stdout=log_handle, stderr=log_handle)
-            except subprocess.CalledProcessError as exc:
-                tail = extract_rfd3_error(log_path)
-                raise RuntimeError(f"RFD3 inference failed. Log snippet:\\n{tail}") from exc
+                for line in process.stdout:
+                    log_handle.write(line)
+                    log_tail.append(line)
+                    print(line, end="", file=sys.stdout)
+                return_code = process.wait()
+            except BaseException:
+                process.kill()
+                raise
+        if return_code != 0:
+            tail = extract_rfd3_error(log_tail)
+            raise RuntimeError(f"RFD3 inference failed with exit code {return_code}. Log snippet:\n{tail}")
 
         cif_paths = sorted(out_dir.glob("*.cif*"))
         if not cif_paths:
@@ -286,93 +336,150 @@ def run_rfdiffusion3(
 
         send_progress(job_id, "rfdiffusion", f"Backbone design complete, processing {len(cif_paths[:num_designs])} designs")
 
-        results: List[dict] = []
-        total_designs = len(cif_paths[:num_designs])
-        for idx, cif_path in enumerate(cif_paths[:num_designs]):
-            send_progress(job_id, "processing", f"Processing design {idx + 1}/{total_designs}")
-
-            complex_path = tmpdir_path / f"complex_{idx}.pdb"
-            cif_to_pdb(cif_path, complex_path)
-
-            output_chain_ids = set(chain_ids_from_structure(complex_path))
-            output_sequences = _extract_chain_sequences(complex_path)
-            target_output_chain_ids = match_output_target_chains(output_sequences, target_sequences)
-            binder_chain_ids = output_chain_ids - target_output_chain_ids
-            if not binder_chain_ids:
-                binder_chain_ids = output_chain_ids - pdb_chain_ids
-            if not binder_chain_ids:
-                output_ordered = ordered_chain_ids_from_pdb(complex_path)
-                if output_ordered:
-                    binder_chain_ids = {output_ordered[-1]}
-            if not binder_chain_ids:
-                raise ValueError("Unable to identify binder chain in RFD3 output.")
+        # First pass: prepare each design locally and fan out the remote
+        # Boltz-2 calls without waiting on them. ProteinMPNN runs once over
+        # all binder backbones after the loop.
+        pending: List[dict] = []
+        target_pdb_text = target_path.read_text()
+        design_cif_paths = cif_paths[:num_designs]
+        total_designs = len(design_cif_paths)
 
-            binder_path = tmpdir_path / f"binder_{idx}.pdb"
-            write_pdb_chains(complex_path, binder_chain_ids, binder_path)
+        # gemmi releases the GIL while parsing/writing, so convert all designs at once
+        complex_paths = [tmpdir_path / f"complex_{idx}.pdb" for idx in range(total_designs)]
+        with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, total_designs)) as convert_pool:
+            converted = list(convert_pool.map(cif_to_pdb_with_chains, design_cif_paths, complex_paths))
 
-            binder_sequences = _extract_chain_sequences(binder_path)
-            backbone_sequence = binder_sequences[0][1] if binder_sequences else ""
+        spawned_calls = []
+        try:
+            for idx, (complex_path, output_ordered) in enumerate(converted):
+                send_progress(job_id, "processing", f"Processing design {idx + 1}/{total_designs}")
+
+                output_chain_ids = set(output_ordered)
+                output_sequences = _extract_chain_sequences(complex_path)
+                target_output_chain_ids = match_output_target_chains(output_sequences, target_sequences)
+                binder_chain_ids = output_chain_ids - target_output_chain_ids
+                if not binder_chain_ids:
+                    binder_chain_ids = output_chain_ids - pdb_chain_ids
+                if not binder_chain_ids and output_ordered:
+                    binder_chain_ids = {output_ordered[-1]}
+                if not binder_chain_ids:
+                    raise ValueError("Unable to identify binder chain in RFD3 output.")
+
+                binder_path = tmpdir_path / f"binder_{idx}.pdb"
+                write_pdb_chains(complex_path, binder_chain_ids, binder_path)
+
+                binder_sequences = _extract_chain_sequences(binder_path)
+                binder_pdb_text = binder_path.read_text()
+
+                boltz_call = None
+                if boltz_samples and boltz_samples > 0:
+                    boltz_call = run_boltz2.spawn(
+                        target_pdb=target_pdb_text,
+                        target_sequences=target_sequences,
+                        binder_pdb=binder_pdb_text,
+                        num_samples=boltz_samples,
+                        job_id=f"{job_id}-b{idx}",
+                    )
+                    spawned_calls.append(boltz_call)
+
+                target_chain_ids_for_metrics = target_output_chain_ids or (output_chain_ids - binder_chain_ids)
+                if not target_chain_ids_for_metrics:
+                    target_chain_ids_for_metrics = pdb_chain_ids
+                metrics = compute_interface_metrics(complex_path, target_chain_ids_for_metrics)
+
+                pending.append(
+                    {
+                        "complex_path": complex_path,
+                        "binder_path": binder_path,
+                        "binder_chain_ids": binder_chain_ids,
+                        "binder_sequences": binder_sequences,
+                        "target_chain_ids": target_chain_ids_for_metrics,
+                        "metrics": metrics,
+                        "binder_pdb_text": binder_pdb_text,
+                        "boltz_call": boltz_call,
+                    }
+                )
 
-            mpnn_sequences: List[dict] = []
-            if sequences_per_backbone and sequences_per_backbone > 0:
-                send_progress(job_id, "proteinmpnn", f"Running ProteinMPNN for design {idx + 1}/{total_designs}")
-                mpnn_result = run_proteinmpnn.remote(
-                    backbone_pdb=binder_path.read_text(),
+            mpnn_call = None
+            if sequences_per_backbone and sequences_per_backbone > 0 and pending:
+                send_progress(job_id, "proteinmpnn", f"Running ProteinMPNN for {total_designs} designs")
+                mpnn_call = run_proteinmpnn_batch.spawn(
+                    backbone_pdbs=[design["binder_pdb_text"] for design in pending],
                     num_sequences=sequences_per_backbone,
-                    job_id=f"{job_id}-mpnn{idx}",
+                    job_id=f"{job_id}-mpnn",
                 )
-                if isinstance(mpnn_result, dict):
-                    mpnn_sequences = mpnn_result.get("sequences", []) or []
-
-            target_chain_ids_for_metrics = target_output_chain_ids or (output_chain_ids - binder_chain_ids)
-            if not target_chain_ids_for_metrics:
-                target_chain_ids_for_metrics = pdb_chain_ids
-            metrics = compute_interface_metrics(complex_path, target_chain_ids_for_metrics)
-
-            boltz_result = None
-            boltz_scores = {}
-            ipsae_scores = {}
+                spawned_calls.append(mpnn_call)
             if boltz_samples and boltz_samples > 0:
-                send_progress(job_id, "boltz", f"Running Boltz-2 scoring for design {idx + 1}/{total_designs}")
-                boltz_result = run_boltz2.remote(
-                    target_pdb=target_path.read_text(),
-                    binder_pdb=binder_path.read_text(),
-                    num_samples=boltz_samples,
-                    job_id=f"{job_id}-b{idx}",
-                )
-                if isinstance(boltz_result, dict):
-                    boltz_scores = boltz_result.get("scores", {})
-                    ipsae_scores = boltz_result.get("ipsae_scores", {})
-
-            binder_key = f"{RESULTS_PREFIX}/{job_id}/binder_{idx}.pdb"
-            complex_key = f"{RESULTS_PREFIX}/{job_id}/complex_{idx}.pdb"
-            upload_file(binder_path, binder_key, content_type="chemical/x-pdb")
-            upload_file(complex_path, complex_key, content_type="chemical/x-pdb")
-
-            target_chain_list = sorted(target_chain_ids_for_metrics)
-            binder_chain_list = sorted(binder_chain_ids)
-
-            combined_scores = {**metrics, **boltz_scores}
-
-            results.append(
-                {
-                    "design_id": f"{job_id}-d{idx}",
-                    "sequence": backbone_sequence,
-                    "mpnn_sequences": mpnn_sequences,
-                    "backbone": {"key": binder_key, "url": object_url(binder_key)},
-                    "complex": {"key": complex_key, "url": object_url(complex_key)},
-                    "scores": combined_scores,
-                    "ipsae_scores": ipsae_scores,
-                    "target_chains": target_chain_list,
-                    "binder_chains": binder_chain_list,
-                    "binder_sequences": [
-                        {"chain_id": chain_id, "sequence": sequence}
-                        for chain_id, sequence in binder_sequences
-                    ],
-                }
-            )
-
-        send_progress(job_id, "upload", "Uploading results")
+                send_progress(job_id, "boltz", f"Running Boltz-2 scoring for {total_designs} designs")
+
+            # Second pass: join the remote calls in order and upload each design.
+            # Uploads run in the background while later designs are joined.
+            mpnn_results: List[dict] = []
+            if mpnn_call is not None:
+                mpnn_batch = mpnn_call.get()
+                if isinstance(mpnn_batch, dict):
+                    mpnn_results = mpnn_batch.get("results", []) or []
+
+            results: List[dict] = []
+            upload_futures = []
+            with ThreadPoolExecutor(max_workers=UPLOAD_MAX_WORKERS) as upload_pool:
+                for idx, design in enumerate(pending):
+                    binder_path = design["binder_path"]
+                    complex_path = design["complex_path"]
+                    binder_sequences = design["binder_sequences"]
+                    backbone_sequence = binder_sequences[0][1] if binder_sequences else ""
+
+                    mpnn_sequences: List[dict] = []
+                    if idx < len(mpnn_results) and isinstance(mpnn_results[idx], dict):
+                        mpnn_sequences = mpnn_results[idx].get("sequences", []) or []
+
+                    boltz_scores = {}
+                    ipsae_scores = {}
+                    if design["boltz_call"] is not None:
+                        boltz_result = design["boltz_call"].get()
+                        if isinstance(boltz_result, dict):
+                            boltz_scores = boltz_result.get("scores", {})
+                            ipsae_scores = boltz_result.get("ipsae_scores", {})
+
+                    binder_key = f"{RESULTS_PREFIX}/{job_id}/binder_{idx}.pdb"
+                    complex_key = f"{RESULTS_PREFIX}/{job_id}/complex_{idx}.pdb"
+                    upload_futures.append(
+                        upload_pool.submit(upload_file, binder_path, binder_key, content_type="chemical/x-pdb")
+                    )
+                    upload_futures.append(
+                        upload_pool.submit(upload_file, complex_path, complex_key, content_type="chemical/x-pdb")
+                    )
+
+                    target_chain_list = sorted(design["target_chain_ids"])
+                    binder_chain_list = sorted(design["binder_chain_ids"])
+
+                    combined_scores = {**design["metrics"], **boltz_scores}
+
+                    results.append(
+                        {
+                            "design_id": f"{job_id}-d{idx}",
+                            "sequence": backbone_sequence,
+                            "mpnn_sequences": mpnn_sequences,
+                            "backbone": {"key": binder_key, "url": object_url(binder_key)},
+                            "complex": {"key": complex_key, "url": object_url(complex_key)},
+                            "scores": combined_scores,
+                            "ipsae_scores": ipsae_scores,
+                            "target_chains": target_chain_list,
+                            "binder_chains": binder_chain_list,
+                            "binder_sequences": [
+                                {"chain_id": chain_id, "sequence": sequence}
+                                for chain_id, sequence in binder_sequences
+                            ],
+                        }
+                    )
+
+                send_progress(job_id, "upload", "Uploading results")
+                for future in upload_futures:
+                    future.result()
+        except BaseException:
+            # Don't leave remote Boltz-2/ProteinMPNN calls running for a failed job
+            _cancel_calls(spawned_calls)
+            raise
 
         manifest = {
             "job_id": job_id,
@@ -386,7 +493,7 @@ def run_rfdiffusion3(
             "designs": results,
         }
         manifest_key = f"{RESULTS_PREFIX}/{job_id}/manifest.json"
-        upload_bytes(json.dumps(manifest, indent=2).encode("utf-8"), manifest_key, "application/json")
+        upload_json(manifest, manifest_key)
 
     execution_seconds = round(time.time() - start_time, 2)
 
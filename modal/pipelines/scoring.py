@@ -21,7 +21,6 @@ from core.job_status import send_progress, send_completion
 from pipelines.proteinmpnn import rng_from_job
 from pipelines.boltz2 import run_boltz2
 from utils.boltz_helpers import _clean_sequence, _extract_chain_sequences
-from utils.metrics import chain_ids_from_structure, compute_interface_metrics
 from utils.pdb import write_pdb_chains
 from utils.storage import download_to_path
 
@@ -84,6 +83,8 @@ def compute_scores(
         target_chain_ids: Optional list of target chain IDs
         use_msa_server: Whether to use MSA server
     """
+    from utils.metrics import chain_ids_from_structure, compute_interface_metrics
+
     init_sentry()
     start_time = time.time()
     job_id = job_id or str(uuid.uuid4())
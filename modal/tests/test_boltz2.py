@@ -0,0 +1,51 @@
+"""Unit tests for Boltz-2 pipeline helpers."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from core.constants import (  # noqa: E402
+    BOLTZ_MSA_BASE_TIMEOUT_SECONDS,
+    BOLTZ_MSA_MIN_TIMEOUT_SECONDS,
+)
+import pipelines.boltz2 as boltz2  # noqa: E402
+from pipelines.boltz2 import msa_timeout_seconds  # noqa: E402
+
+
+class TestMsaTimeoutSeconds(unittest.TestCase):
+    """Tests for the size-scaled MSA server timeout."""
+
+    def test_grows_with_residue_count(self) -> None:
+        """Larger complexes should get a longer timeout."""
+        small = msa_timeout_seconds([("A", "A" * 100), ("B", "G" * 80)])
+        large = msa_timeout_seconds([("A", "A" * 2000), ("B", "G" * 80)])
+        self.assertGreater(large, small)
+
+    def test_grows_with_chain_count(self) -> None:
+        """Splitting the same residues over more chains should not shorten the timeout."""
+        one_chain = msa_timeout_seconds([("A", "A" * 200)])
+        two_chains = msa_timeout_seconds([("A", "A" * 100), ("B", "A" * 100)])
+        self.assertGreater(two_chains, one_chain)
+
+    def test_respects_minimum(self) -> None:
+        """Timeout should never drop below the configured minimum."""
+        timeout = msa_timeout_seconds([])
+        self.assertGreaterEqual(timeout, BOLTZ_MSA_MIN_TIMEOUT_SECONDS)
+        self.assertGreaterEqual(timeout, BOLTZ_MSA_BASE_TIMEOUT_SECONDS)
+
+    def test_explicit_total_timeout_overrides_scaling(self) -> None:
+        """BOLTZ_MSA_TIMEOUT_SECONDS, when set, is the total timeout."""
+        with patch.object(boltz2, "BOLTZ_MSA_TIMEOUT_SECONDS", 600):
+            self.assertEqual(msa_timeout_seconds([("A", "A" * 2000)]), 600)
+            self.assertEqual(msa_timeout_seconds([]), 600)
+
+
+if __name__ == "__main__":
+    unittest.main()
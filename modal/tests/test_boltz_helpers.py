@@ -5,6 +5,7 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -12,8 +13,11 @@ if str(ROOT) not in sys.path:
 
 from utils.boltz_helpers import (  # noqa: E402
   _boltz_prediction_dirs,
+  _boltz_yaml_payload,
   _clean_sequence,
+  _disable_msa_server,
   _extract_chain_sequences,
+  _extract_chain_sequences_cached,
   _read_boltz_confidence,
   _select_boltz_prediction,
   _select_chain_id,
@@ -39,6 +43,20 @@ class BoltzHelpersTest(unittest.TestCase):
     self.assertEqual(lengths["A"], 3)
     self.assertEqual(lengths["B"], 3)
 
+  def test_extract_chain_sequences_cached_by_content(self) -> None:
+    pdb_path = ROOT.parent / "sample_data/pdb/mini_complex.pdb"
+    expected = _extract_chain_sequences(pdb_path)
+    with tempfile.TemporaryDirectory() as tmpdir:
+      copy_path = Path(tmpdir) / "target.pdb"
+      copy_path.write_bytes(pdb_path.read_bytes())
+      first = _extract_chain_sequences_cached(copy_path)
+      first.append(("Z", "X"))
+      with mock.patch(
+        "utils.boltz_helpers._extract_chain_sequences",
+        side_effect=AssertionError("should not reparse"),
+      ):
+        self.assertEqual(_extract_chain_sequences_cached(pdb_path), expected)
+
   def test_write_boltz_yaml_respects_msa_toggle(self) -> None:
     with tempfile.TemporaryDirectory() as tmpdir:
       path = Path(tmpdir) / "input.yaml"
@@ -62,6 +80,30 @@ class BoltzHelpersTest(unittest.TestCase):
       content = path.read_text()
       self.assertNotIn("msa: empty", content)
 
+  def test_disable_msa_server_keeps_precomputed_msas(self) -> None:
+    payload = _boltz_yaml_payload(
+      target_sequences=[("A", "AAA")],
+      binder_sequence="BBB",
+      binder_chain_id="B",
+      use_msa_server=True,
+      msa_paths={"A": "/msa/A.a3m"},
+    )
+    self.assertNotIn("msa", payload["sequences"][1]["protein"])
+
+    _disable_msa_server(payload)
+    self.assertEqual(payload["sequences"][0]["protein"]["msa"], "/msa/A.a3m")
+    self.assertEqual(payload["sequences"][1]["protein"]["msa"], "empty")
+    self.assertEqual(
+      payload,
+      _boltz_yaml_payload(
+        target_sequences=[("A", "AAA")],
+        binder_sequence="BBB",
+        binder_chain_id="B",
+        use_msa_server=False,
+        msa_paths={"A": "/msa/A.a3m"},
+      ),
+    )
+
   def test_prediction_dirs_uses_manifest(self) -> None:
     with tempfile.TemporaryDirectory() as tmpdir:
       out_dir = Path(tmpdir)
@@ -93,6 +135,18 @@ class BoltzHelpersTest(unittest.TestCase):
       confidence = _read_boltz_confidence(out_dir, "sample")
       self.assertEqual(confidence["ptm"], 0.1)
 
+  def test_select_prediction_falls_back_to_scan(self) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+      out_dir = Path(tmpdir)
+      pred_dir = out_dir / "predictions" / "sample"
+      pred_dir.mkdir(parents=True)
+      pred_path = pred_dir / "sample_model_1.cif"
+      pred_path.write_text("data_sample\n")
+      (pred_dir / "confidence_sample_model_1.json").write_text(json.dumps({"ptm": 0.5}))
+
+      self.assertEqual(_select_boltz_prediction(out_dir, "sample"), pred_path)
+      self.assertEqual(_read_boltz_confidence(out_dir, "sample")["ptm"], 0.5)
+
 
 if __name__ == "__main__":
   unittest.main()
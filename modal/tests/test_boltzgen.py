@@ -13,6 +13,9 @@ if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
 from pipelines.boltzgen import (  # noqa: E402
+    BOLTZGEN_STAGE_GROUPS,
+    BOLTZGEN_STAGE_RE,
+    _count_files_with_suffixes,
     build_binding_types,
     find_boltzgen_structures,
     parse_boltzgen_metrics,
@@ -230,6 +233,19 @@ class TestParseBoltzgenMetrics(unittest.TestCase):
             self.assertEqual(len(results), 1)
             self.assertEqual(results[0]["score"], "0.9")
 
+    def test_parse_prefers_nested_final_metrics(self) -> None:
+        """A final_designs_metrics file anywhere should win over all_designs_metrics."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = Path(tmpdir)
+            (output_dir / "all_designs_metrics.csv").write_text("design_id\nall\n")
+            nested_dir = output_dir / "final_ranked_designs" / "nested"
+            nested_dir.mkdir(parents=True)
+            (nested_dir / "final_designs_metrics_3.csv").write_text("design_id\nfinal\n")
+
+            results = parse_boltzgen_metrics(output_dir, budget=5)
+
+            self.assertEqual(results, [{"design_id": "final"}])
+
     def test_parse_no_metrics_file(self) -> None:
         """Should return empty list if no metrics file exists."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -299,6 +315,37 @@ class TestBoltzgenBindingTypes(unittest.TestCase):
         self.assertEqual(binding_types, [{"chain": {"id": "A", "binding": "10"}}])
 
 
+class TestBoltzgenStageRegex(unittest.TestCase):
+    """Tests for BoltzGen log stage detection."""
+
+    def test_one_stage_per_line_in_table_order(self) -> None:
+        """Each line should report only the first table pattern it contains."""
+        data = (
+            b"Filtering with Boltz scores\n"
+            b"no stage here\n"
+            b"Generated 4 designs; Running inverse folding\n"
+        )
+        stages = [BOLTZGEN_STAGE_GROUPS[m.lastgroup] for m in BOLTZGEN_STAGE_RE.finditer(data)]
+        self.assertEqual(
+            [stage for stage, _ in stages],
+            ["folding", "design"],
+        )
+
+    def test_carriage_return_ends_a_line(self) -> None:
+        """tqdm-style carriage return redraws should be scanned as separate lines."""
+        data = b"Running diffusion 10%\rRunning diffusion 50%\rDiffusion complete\r\nAnalyzing\n"
+        stages = [BOLTZGEN_STAGE_GROUPS[m.lastgroup] for m in BOLTZGEN_STAGE_RE.finditer(data)]
+        self.assertEqual(
+            [message for _, message in stages],
+            [
+                "Running diffusion backbone generation",
+                "Running diffusion backbone generation",
+                "Backbone diffusion complete ({num_designs} designs)",
+                "Computing design metrics",
+            ],
+        )
+
+
 class TestFindBoltzgenStructures(unittest.TestCase):
     """Tests for BoltzGen structure file discovery."""
 
@@ -387,6 +434,18 @@ class TestFindBoltzgenStructures(unittest.TestCase):
             extensions = {s.suffix for s in structures}
             self.assertEqual(extensions, {".cif", ".pdb"})
 
+    def test_count_files_with_suffixes(self) -> None:
+        """Should count matching files only, and treat a missing dir as empty."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            stage_dir = Path(tmpdir)
+            (stage_dir / "design_0.cif").write_text("data_0\n")
+            (stage_dir / "design_1.cif").write_text("data_1\n")
+            (stage_dir / "design_0.npz").write_text("")
+            (stage_dir / "nested.cif").mkdir()
+
+            self.assertEqual(_count_files_with_suffixes(stage_dir, (".cif",)), 2)
+            self.assertEqual(_count_files_with_suffixes(stage_dir / "missing", (".cif",)), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
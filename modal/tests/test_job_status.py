@@ -0,0 +1,116 @@
+"""Unit tests for buffered job status tracking."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+import core.job_status as job_status  # noqa: E402
+
+
+class _CountingDict(dict):
+    """Stand-in for the Modal Dict that counts reads and writes."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+        self.writes = 0
+
+    def get(self, key, default=None):
+        self.reads += 1
+        return super().get(key, default)
+
+    def __setitem__(self, key, value) -> None:
+        self.writes += 1
+        super().__setitem__(key, value)
+
+
+def _cancel_flush_timers() -> None:
+    for timer in job_status._flush_timers.values():
+        timer.cancel()
+    job_status._flush_timers.clear()
+
+
+class TestSendProgress(unittest.TestCase):
+    """Tests for progress buffering."""
+
+    def setUp(self) -> None:
+        self.store = _CountingDict()
+        patcher = patch.object(job_status, "job_status_dict", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(job_status._local_cache.clear)
+        self.addCleanup(job_status._dirty.clear)
+        self.addCleanup(_cancel_flush_timers)
+
+    def test_same_stage_updates_are_coalesced(self) -> None:
+        """Repeated same-stage progress should only write on the first event."""
+        with patch("builtins.print"):
+            for idx in range(20):
+                job_status.send_progress("job-1", "design", f"step {idx}")
+        self.assertEqual(self.store.writes, 1)
+        self.assertEqual(len(job_status.get_job_status("job-1")["progress"]), 20)
+
+    def test_stage_change_and_completion_flush(self) -> None:
+        """A new stage writes immediately and completion persists buffered events."""
+        with patch("builtins.print"):
+            job_status.send_progress("job-2", "design", "a")
+            job_status.send_progress("job-2", "design", "b")
+            job_status.send_progress("job-2", "score", "c")
+            self.assertEqual(self.store.writes, 2)
+            job_status.send_progress("job-2", "score", "d")
+            job_status.send_completion("job-2", status="completed", output={"ok": True})
+
+        stored = self.store["job-2"]
+        self.assertEqual(stored["status"], "completed")
+        self.assertEqual([event["message"] for event in stored["progress"]], ["a", "b", "c", "d"])
+        self.assertNotIn("job-2", job_status._local_cache)
+
+    def test_buffered_progress_flushes_on_timer(self) -> None:
+        """The last same-stage event should reach the store without a later event."""
+        with patch("builtins.print"), patch.object(
+            job_status, "PROGRESS_FLUSH_INTERVAL_SECONDS", 0.2
+        ):
+            job_status.send_progress("job-4", "design", "a")
+            job_status.send_progress("job-4", "design", "b")
+            timer = job_status._flush_timers["job-4"]
+            self.assertEqual(self.store.writes, 1)
+            self.assertIn("job-4", job_status._dirty)
+            timer.join(timeout=2)
+
+        self.assertEqual(self.store.writes, 2)
+        self.assertEqual([event["message"] for event in self.store["job-4"]["progress"]], ["a", "b"])
+        self.assertNotIn("job-4", job_status._dirty)
+
+    def test_get_job_status_returns_copy(self) -> None:
+        """Mutating a returned status must not change the buffered copy."""
+        with patch("builtins.print"):
+            job_status.send_progress("job-5", "design", "a")
+        job_status.get_job_status("job-5")["progress"].clear()
+        self.assertEqual(len(job_status.get_job_status("job-5")["progress"]), 1)
+
+    def test_failure_evicts_and_keeps_loaded_fields(self) -> None:
+        """Only the first update reads the Dict; its fields are carried through."""
+        self.store["job-6"] = {"job_id": "job-6", "status": "pending", "progress": [], "request": {"from": "api"}}
+        self.store.writes = 0
+        with patch("builtins.print"):
+            job_status.send_progress("job-6", "design", "a")
+            job_status.send_progress("job-6", "score", "b")
+            job_status.send_usage_update("job-6", "A10G", 1.0)
+        job_status.update_job_status("job-6", status="failed", error="boom")
+
+        self.assertEqual(self.store.reads, 1)
+        self.assertEqual(self.store.writes, 4)
+        self.assertNotIn("job-6", job_status._local_cache)
+        self.assertNotIn("job-6", job_status._last_stage)
+        self.assertEqual(self.store["job-6"]["status"], "failed")
+        self.assertEqual(self.store["job-6"]["request"], {"from": "api"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""Unit tests for mBER integration helpers."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from integrations.mber import parse_accepted_csv  # noqa: E402
+
+ACCEPTED_CSV = """trajectory_name,binder_index,binder_seq,i_ptm,plddt,ptm,extra
+traj_0,0,AAAA,0.61,80.5,0.70,x
+traj_1,1,,0.99,90.0,0.90,x
+traj_2,2,CCCC,0.83,85.0,0.75,x
+traj_3,3,DDDD,,70.0,0.60,x
+traj_4,4,EEEE,0.72,88.0,0.81
+"""
+
+
+class TestParseAcceptedCsv(unittest.TestCase):
+    """Tests for reading mBER accepted binders."""
+
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmpdir.name) / "accepted.csv"
+        self.path.write_text(ACCEPTED_CSV)
+
+    def tearDown(self) -> None:
+        self._tmpdir.cleanup()
+
+    def test_parses_rows_with_sequences(self) -> None:
+        """Rows without a binder sequence are skipped and blanks default to zero."""
+        rows = parse_accepted_csv(self.path)
+        self.assertEqual([row["binder_seq"] for row in rows], ["AAAA", "CCCC", "DDDD", "EEEE"])
+        self.assertEqual(rows[2]["i_ptm"], 0.0)
+        self.assertEqual(rows[3]["binder_index"], 4)
+        self.assertIsNone(rows[0]["complex_pdb_path"])
+
+    def test_missing_or_empty_file(self) -> None:
+        """A missing or empty CSV yields no rows."""
+        self.assertEqual(parse_accepted_csv(self.path.with_name("missing.csv")), [])
+        self.path.write_text("")
+        self.assertEqual(parse_accepted_csv(self.path), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
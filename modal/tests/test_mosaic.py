@@ -0,0 +1,44 @@
+"""Unit tests for Mosaic integration helpers."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from integrations.mosaic import (  # noqa: E402
+    MOSAIC_TOKENS,
+    decode_soft_sequence,
+)
+
+
+class TestDecodeSoftSequence(unittest.TestCase):
+    """Tests for argmax decoding of soft sequences."""
+
+    def test_matches_row_argmax(self) -> None:
+        """Each position should decode to its highest-scoring token, first on ties."""
+        rng = np.random.default_rng(0)
+        soft = rng.random((50, len(MOSAIC_TOKENS)))
+        soft[0] = 1.0
+        expected = "".join(MOSAIC_TOKENS[int(np.argmax(row))] for row in soft)
+        self.assertEqual(decode_soft_sequence(soft), expected)
+        self.assertEqual(decode_soft_sequence(soft.tolist()), expected)
+        self.assertEqual(decode_soft_sequence(iter(soft.tolist())), expected)
+        self.assertEqual(expected[0], MOSAIC_TOKENS[0])
+
+    def test_ragged_and_empty_rows(self) -> None:
+        """Empty rows are skipped and ragged input still decodes."""
+        self.assertEqual(decode_soft_sequence([[0.0, 1.0], [], [2.0, 1.0, 0.0]]), "RA")
+        self.assertEqual(decode_soft_sequence([]), "")
+        # Padding must never outrank real (negative) logits
+        self.assertEqual(decode_soft_sequence([[-2.0, -1.0], [-3.0, -5.0, -1.0]]), "RN")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+"""Unit tests for PDB parsing utilities."""
+
+from __future__ import annotations
+
+import gzip
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from utils.boltz_helpers import _extract_chain_sequences  # noqa: E402
+from utils.pdb import (  # noqa: E402
+    chain_lengths_from_pdb,
+    cif_chain_sequences,
+    cif_to_pdb,
+    cif_to_pdb_with_chains,
+    chain_residue_segments_from_pdb,
+    estimate_backbone_length,
+    format_hotspot_residues,
+    ordered_chain_ids_from_pdb,
+    parse_pdb_ca,
+    write_pdb_chains,
+)
+
+
+def _atom(serial: int, name: str, res_name: str, chain: str, res_seq: int) -> str:
+    return (
+        f"ATOM  {serial:5d} {name:^4} {res_name:>3} {chain}{res_seq:4d}    "
+        f"{0.0:8.3f}{0.0:8.3f}{0.0:8.3f}  1.00  0.00           C"
+    )
+
+
+SAMPLE_PDB = "\n".join(
+    [
+        _atom(1, "N", "GLY", "B", 1),
+        _atom(2, "CA", "GLY", "B", 1),
+        _atom(3, "CA", "ALA", "B", 2),
+        _atom(4, "CA", "ALA", "B", 5),
+        "TER",
+        _atom(5, "N", "GLY", "A", 10),
+        _atom(6, "CA", "GLY", "A", 10),
+        "HETATM    7  O   HOH A 100       0.000   0.000   0.000  1.00  0.00           O",
+        "END",
+    ]
+) + "\n"
+
+
+class TestParsePdbCa(unittest.TestCase):
+    """Tests for the single-pass PDB summary parser."""
+
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmpdir.name) / "sample.pdb"
+        self.path.write_text(SAMPLE_PDB)
+
+    def tearDown(self) -> None:
+        self._tmpdir.cleanup()
+
+    def test_single_pass_summary(self) -> None:
+        """Should report CA count, chain lengths, segments and chain order."""
+        ca_count, lengths, segments, ordered = parse_pdb_ca(self.path)
+        self.assertEqual(ca_count, 4)
+        self.assertEqual(lengths, {"B": 3, "A": 1})
+        self.assertEqual(segments, {"B": [(1, 2), (5, 5)], "A": [(10, 10)]})
+        self.assertEqual(ordered, ["B", "A"])
+
+    def test_wrappers_match_summary(self) -> None:
+        """Per-field helpers should agree with the fused parser."""
+        self.assertEqual(estimate_backbone_length(self.path), 60)
+        self.assertEqual(chain_lengths_from_pdb(self.path), {"B": 3, "A": 1})
+        self.assertEqual(
+            chain_residue_segments_from_pdb(self.path),
+            {"B": [(1, 2), (5, 5)], "A": [(10, 10)]},
+        )
+        self.assertEqual(ordered_chain_ids_from_pdb(self.path), ["B", "A"])
+
+    def test_short_lines_and_blank_residue_numbers(self) -> None:
+        """Truncated ATOM lines and unparsable residue numbers should not break counting."""
+        self.path.write_text(
+            "\n".join(
+                [
+                    "ATOM",
+                    _atom(1, "CA", "GLY", "A", 1),
+                    _atom(2, "CA", "GLY", "A", 2)[:22] + "    ",
+                    _atom(3, "CA", "GLY", "A", 3),
+                ]
+            )
+        )
+        ca_count, lengths, segments, ordered = parse_pdb_ca(self.path)
+        self.assertEqual(ca_count, 3)
+        self.assertEqual(lengths, {"A": 3})
+        self.assertEqual(segments, {"A": [(1, 1), (3, 3)]})
+        self.assertEqual(ordered, ["_", "A"])
+
+
+class TestWritePdbChains(unittest.TestCase):
+    """Tests for line-based PDB chain extraction."""
+
+    def test_keeps_selected_chain_records(self) -> None:
+        """Should keep ATOM/HETATM/TER records for the selected chains only."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "sample.pdb"
+            source.write_text(SAMPLE_PDB)
+            output = Path(tmpdir) / "chain_a.pdb"
+
+            mapping = write_pdb_chains(source, {"A"}, output)
+
+            self.assertEqual(mapping, {"A": "A"})
+            lines = output.read_text().splitlines()
+            self.assertEqual(len(lines), 4)
+            self.assertTrue(all(line[21] == "A" for line in lines[:3]))
+            self.assertTrue(lines[2].startswith("HETATM"))
+            self.assertEqual(lines[-1], "END")
+
+
+class TestCifToPdb(unittest.TestCase):
+    """Tests for mmCIF to PDB conversion."""
+
+    def test_converts_plain_and_gzipped_cif(self) -> None:
+        """Should produce identical PDB atoms from .cif and .cif.gz inputs."""
+        cif_path = ROOT / "assets/boltzgen/nanobody_scaffolds/7eow.cif"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gz_path = Path(tmpdir) / "7eow.cif.gz"
+            gz_path.write_bytes(gzip.compress(cif_path.read_bytes()))
+
+            plain_pdb = cif_to_pdb(cif_path, Path(tmpdir) / "plain.pdb")
+            gz_pdb = cif_to_pdb(gz_path, Path(tmpdir) / "gz.pdb")
+
+            self.assertEqual(plain_pdb.read_text(), gz_pdb.read_text())
+            ca_count, _, _, ordered = parse_pdb_ca(plain_pdb)
+            self.assertGreater(ca_count, 0)
+            self.assertEqual(ordered, ["A", "B"])
+
+    def test_reports_chain_ids(self) -> None:
+        """Chain IDs from the converted structure should match a re-parse of the PDB."""
+        cif_path = ROOT / "assets/boltzgen/nanobody_scaffolds/7eow.cif"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdb_path, chain_ids = cif_to_pdb_with_chains(cif_path, Path(tmpdir) / "out.pdb")
+            self.assertEqual(chain_ids, ordered_chain_ids_from_pdb(pdb_path))
+
+    def test_cif_chain_sequences_match_converted_pdb(self) -> None:
+        """Sequences read directly from the CIF should match the PDB round-trip."""
+        cif_path = ROOT / "assets/boltzgen/nanobody_scaffolds/7eow.cif"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdb_path = cif_to_pdb(cif_path, Path(tmpdir) / "out.pdb")
+            self.assertEqual(cif_chain_sequences(cif_path), _extract_chain_sequences(pdb_path))
+
+    def test_cif_chain_sequences_without_entity_categories(self) -> None:
+        """Sequences should still be read when the CIF has no _entity categories."""
+        import gemmi
+
+        cif_path = ROOT / "assets/boltzgen/nanobody_scaffolds/7eow.cif"
+        doc = gemmi.cif.read(str(cif_path))
+        block = doc.sole_block()
+        for name in block.get_mmcif_category_names():
+            if name.startswith(("_entity", "_pdbx_entity", "_struct_asym", "_pdbx_poly")):
+                block.find_mmcif_category(name).erase()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            stripped_path = Path(tmpdir) / "no_entities.cif"
+            doc.write_file(str(stripped_path))
+            self.assertEqual(cif_chain_sequences(stripped_path), cif_chain_sequences(cif_path))
+
+    def test_cif_chain_sequences_maps_selenomethionine(self) -> None:
+        """MSE should read as M and other non-standard residues should be skipped."""
+        import gemmi
+
+        structure = gemmi.read_structure(str(ROOT / "assets/boltzgen/nanobody_scaffolds/7eow.cif"))
+        structure.setup_entities()
+        expected = dict(cif_chain_sequences(ROOT / "assets/boltzgen/nanobody_scaffolds/7eow.cif"))["B"]
+        polymer = structure[0]["B"].get_polymer()
+        polymer[0].name = "MSE"
+        polymer[1].name = "SEP"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            modified_path = Path(tmpdir) / "modified.cif"
+            structure.make_mmcif_document().write_file(str(modified_path))
+            sequences = dict(cif_chain_sequences(modified_path))
+        self.assertEqual(sequences["B"], "M" + expected[2:])
+
+
+class TestFormatHotspotResidues(unittest.TestCase):
+    """Tests for hotspot residue normalization."""
+
+    def test_accepts_common_separators(self) -> None:
+        """Should parse chain-prefixed specs and bare residue numbers."""
+        formatted = format_hotspot_residues(["A45", "b:12", "C-007", "D 3", "88", "??"], "A")
+        self.assertEqual(formatted, "A45,B12,C7,D3,A88")
+
+    def test_empty_input(self) -> None:
+        """Should return None when nothing parses."""
+        self.assertIsNone(format_hotspot_residues(None, "A"))
+        self.assertIsNone(format_hotspot_residues(["", "xyz"], "A"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Unit tests for ProteinMPNN output parsing."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from pipelines.proteinmpnn import _mpnn_sampling_args, parse_mpnn_fasta, rng_from_job  # noqa: E402
+
+
+class TestParseMpnnFasta(unittest.TestCase):
+    """Tests for ProteinMPNN FASTA parsing."""
+
+    def test_parses_records_and_scores(self) -> None:
+        """Should join wrapped sequences, read scores and skip empty records."""
+        fasta = (
+            ">backbone_0, score=1.5, global_score=1.5\n"
+            "ACDE\n"
+            "FG\n"
+            "\n"
+            ">T=0.1, sample=1, score=0.75, seq_recovery=0.4\n"
+            "\n"
+            ">T=0.1, sample=2, score=0.5, seq_recovery=0.5\r\n"
+            "KKLL\r\n"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "backbone_0.fa"
+            path.write_text(fasta)
+            records = parse_mpnn_fasta(path)
+
+        self.assertEqual(
+            records,
+            [
+                {"sequence": "ACDEFG", "score": 1.5, "log_prob": -1.5},
+                {"sequence": "KKLL", "score": 0.5, "log_prob": -0.5},
+            ],
+        )
+
+
+class TestMpnnSamplingArgs(unittest.TestCase):
+    """Tests for ProteinMPNN batch sizing."""
+
+    def _sampled(self, num_sequences: int) -> tuple[int, int]:
+        _, args = _mpnn_sampling_args(num_sequences, seed=None)
+        total = int(args[args.index("--num_seq_per_target") + 1])
+        batch_size = int(args[args.index("--batch_size") + 1])
+        return total, batch_size
+
+    def test_minimizes_over_generation(self) -> None:
+        """Should keep the batch count minimal while sampling as few extras as possible."""
+        with patch("pipelines.proteinmpnn.PROTEINMPNN_BATCH_SIZE", 8):
+            self.assertEqual(self._sampled(4), (4, 4))
+            self.assertEqual(self._sampled(8), (8, 8))
+            self.assertEqual(self._sampled(9), (10, 5))
+            self.assertEqual(self._sampled(16), (16, 8))
+            self.assertEqual(self._sampled(17), (18, 6))
+            self.assertEqual(self._sampled(0), (1, 1))
+
+
+class TestRngFromJob(unittest.TestCase):
+    """Tests for job-seeded random generators."""
+
+    def test_non_uuid_ids_are_deterministic_and_distinct(self) -> None:
+        """Anagram job IDs should no longer share a seed."""
+        self.assertEqual(rng_from_job("job-abc").random(), rng_from_job("job-abc").random())
+        self.assertNotEqual(rng_from_job("job-abc").random(), rng_from_job("job-cba").random())
+
+
+if __name__ == "__main__":
+    unittest.main()
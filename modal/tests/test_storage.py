@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import math
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+  sys.path.append(str(ROOT))
+
+from utils import storage  # noqa: E402
+
+
+class UploadJsonTest(unittest.TestCase):
+  def _upload(self, obj, **kwargs) -> bytes:
+    with mock.patch.object(storage, "upload_bytes", return_value={}) as upload_bytes:
+      storage.upload_json(obj, "results/job/manifest.json", **kwargs)
+    data = upload_bytes.call_args.args[0]
+    self.assertEqual(upload_bytes.call_args.args[1], "results/job/manifest.json")
+    self.assertEqual(upload_bytes.call_args.kwargs["content_type"], "application/json")
+    return data
+
+  def test_finite_payload_keeps_indent_and_numpy(self) -> None:
+    data = self._upload({"scores": {"iptm": np.float32(0.5)}, "coords": np.arange(3)})
+    self.assertEqual(json.loads(data), {"scores": {"iptm": 0.5}, "coords": [0, 1, 2]})
+    self.assertIn(b'\n  "scores"', data)
+
+  def test_nan_metric_is_null_by_default(self) -> None:
+    data = self._upload({"scores": {"iptm": float("nan"), "plddt": 0.9}})
+    self.assertEqual(json.loads(data), {"scores": {"iptm": None, "plddt": 0.9}})
+
+  def test_allow_nan_keeps_nan_metric(self) -> None:
+    data = self._upload(
+      {"scores": {"iptm": float("nan"), "pae": np.float32("inf"), "plddt": 0.9}},
+      allow_nan=True,
+    )
+    self.assertIn(b"NaN", data)
+    self.assertNotIn(b"null", data)
+    scores = json.loads(data)["scores"]
+    self.assertTrue(math.isnan(scores["iptm"]))
+    self.assertEqual(scores["pae"], math.inf)
+    self.assertEqual(scores["plddt"], 0.9)
+    self.assertIn(b'\n  "scores"', data)
+
+
+if __name__ == "__main__":
+  unittest.main()
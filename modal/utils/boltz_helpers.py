@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import string
+from collections import OrderedDict
 from pathlib import Path
 from typing import List
 
@@ -29,6 +31,28 @@ def _extract_chain_sequences(path: Path) -> List[tuple[str, str]]:
   return sequences
 
 
+# Keyed on a digest of the file contents so the same target downloaded into a
+# fresh temp dir by each call on a warm container is only parsed once.
+_CHAIN_SEQUENCE_CACHE_SIZE = 64
+_chain_sequence_cache: OrderedDict[tuple[str, str], tuple[tuple[str, str], ...]] = (
+  OrderedDict()
+)
+
+
+def _extract_chain_sequences_cached(path: Path) -> List[tuple[str, str]]:
+  digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+  key = (digest, path.suffix.lower())
+  cached = _chain_sequence_cache.get(key)
+  if cached is None:
+    cached = tuple(_extract_chain_sequences(path))
+    _chain_sequence_cache[key] = cached
+    if len(_chain_sequence_cache) > _CHAIN_SEQUENCE_CACHE_SIZE:
+      _chain_sequence_cache.popitem(last=False)
+  else:
+    _chain_sequence_cache.move_to_end(key)
+  return list(cached)
+
+
 def _select_chain_id(used: set[str]) -> str:
   for letter in string.ascii_uppercase + string.ascii_lowercase:
     if letter not in used:
@@ -36,33 +60,37 @@ def _select_chain_id(used: set[str]) -> str:
   raise ValueError("Unable to select an unused chain id for the binder.")
 
 
-def _write_boltz_yaml(
+def _boltz_yaml_payload(
   target_sequences: List[tuple[str, str]],
   binder_sequence: str | None = None,
   binder_chain_id: str | None = None,
-  output_path: Path = None,
   use_msa_server: bool = True,
   msa_paths: dict[str, str] | None = None,
   binder_sequences: List[tuple[str, str]] | None = None,
-) -> Path:
+) -> dict:
   """
-  Write a Boltz input YAML file.
+  Build the Boltz input payload (the YAML document as a dict).
 
   Args:
     target_sequences: List of (chain_id, sequence) tuples for target chains
     binder_sequence: Single binder sequence (for single-chain binders like nanobodies)
     binder_chain_id: Chain ID to assign to single binder
-    output_path: Path to write YAML file
     use_msa_server: If True, let Boltz use its MSA server
     msa_paths: Optional dict mapping chain_id -> A3M file path for pre-computed MSAs
     binder_sequences: List of (chain_id, sequence) tuples for multi-chain binders (e.g., antibody H+L)
   """
-  import yaml
-
   msa_paths = msa_paths or {}
 
+  chains: List[tuple[str, str]] = list(target_sequences)
+  if binder_sequences:
+    # Multi-chain binders (e.g., antibody H+L chains)
+    chains.extend(binder_sequences)
+  elif binder_sequence and binder_chain_id:
+    # Single-chain binder (nanobody, designed binder, etc.)
+    chains.append((binder_chain_id, binder_sequence))
+
   sequences_payload: List[dict] = []
-  for chain_id, sequence in target_sequences:
+  for chain_id, sequence in chains:
     entry = {"protein": {"id": chain_id, "sequence": sequence}}
     if chain_id in msa_paths:
       # Use pre-computed MSA
@@ -71,29 +99,48 @@ def _write_boltz_yaml(
       entry["protein"]["msa"] = "empty"
     sequences_payload.append(entry)
 
-  # Handle multi-chain binders (e.g., antibody H+L chains)
-  if binder_sequences:
-    for chain_id, sequence in binder_sequences:
-      binder_entry = {"protein": {"id": chain_id, "sequence": sequence}}
-      if chain_id in msa_paths:
-        binder_entry["protein"]["msa"] = msa_paths[chain_id]
-      elif not use_msa_server:
-        binder_entry["protein"]["msa"] = "empty"
-      sequences_payload.append(binder_entry)
-  elif binder_sequence and binder_chain_id:
-    # Single-chain binder (nanobody, designed binder, etc.)
-    binder_entry = {"protein": {"id": binder_chain_id, "sequence": binder_sequence}}
-    if binder_chain_id in msa_paths:
-      binder_entry["protein"]["msa"] = msa_paths[binder_chain_id]
-    elif not use_msa_server:
-      binder_entry["protein"]["msa"] = "empty"
-    sequences_payload.append(binder_entry)
+  return {"version": 1, "sequences": sequences_payload}
+
+
+def _disable_msa_server(payload: dict) -> dict:
+  """Switch a payload built for the MSA server to single-sequence mode in place."""
+  for entry in payload.get("sequences", []):
+    entry["protein"].setdefault("msa", "empty")
+  return payload
+
+
+def _dump_boltz_yaml(payload: dict, output_path: Path) -> Path:
+  import yaml
 
-  payload = {"version": 1, "sequences": sequences_payload}
   output_path.write_text(yaml.safe_dump(payload, sort_keys=False))
   return output_path
 
 
+def _write_boltz_yaml(
+  target_sequences: List[tuple[str, str]],
+  binder_sequence: str | None = None,
+  binder_chain_id: str | None = None,
+  output_path: Path = None,
+  use_msa_server: bool = True,
+  msa_paths: dict[str, str] | None = None,
+  binder_sequences: List[tuple[str, str]] | None = None,
+) -> Path:
+  """
+  Write a Boltz input YAML file.
+
+  See `_boltz_yaml_payload` for the meaning of the arguments.
+  """
+  payload = _boltz_yaml_payload(
+    target_sequences=target_sequences,
+    binder_sequence=binder_sequence,
+    binder_chain_id=binder_chain_id,
+    use_msa_server=use_msa_server,
+    msa_paths=msa_paths,
+    binder_sequences=binder_sequences,
+  )
+  return _dump_boltz_yaml(payload, output_path)
+
+
 def _boltz_prediction_dirs(out_dir: Path, input_name: str) -> list[Path]:
   predictions_dir = out_dir / "predictions"
   if not predictions_dir.exists():
@@ -125,6 +172,13 @@ def _boltz_prediction_dirs(out_dir: Path, input_name: str) -> list[Path]:
 
 
 def _select_boltz_prediction(out_dir: Path, input_name: str) -> Path:
+  # Boltz writes the top-ranked sample to a fixed path; check it before scanning
+  pred_dir = out_dir / "predictions" / input_name
+  for suffix in (".pdb", ".cif"):
+    direct_path = pred_dir / f"{input_name}_model_0{suffix}"
+    if direct_path.exists():
+      return direct_path
+
   pred_dirs = _boltz_prediction_dirs(out_dir, input_name)
   candidates: list[Path] = []
   for pred_dir in pred_dirs:
@@ -140,6 +194,10 @@ def _select_boltz_prediction(out_dir: Path, input_name: str) -> Path:
 
 
 def _read_boltz_confidence(out_dir: Path, input_name: str) -> dict:
+  direct_path = out_dir / "predictions" / input_name / f"confidence_{input_name}_model_0.json"
+  if direct_path.exists():
+    return json.loads(direct_path.read_text())
+
   pred_dirs = _boltz_prediction_dirs(out_dir, input_name)
   candidates: list[Path] = []
   for pred_dir in pred_dirs:
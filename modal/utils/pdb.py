@@ -5,19 +5,103 @@ PDB file parsing and manipulation utilities.
 from __future__ import annotations
 
 import difflib
-import gzip
 import re
 from pathlib import Path
 from typing import List
 
+import numpy as np
+
+# Matches hotspot residue specs such as "A45", "A:45", "A-45" or "a 45"
+HOTSPOT_RE = re.compile(r"([A-Za-z])\s*[:\-_/]?\s*(\d+)")
+
+# Fixed-width PDB columns read by parse_pdb_ca: atom name (12-15), chain ID (21)
+# and residue number (22-25).
+_PDB_COLUMNS = np.array([12, 13, 14, 15, 21, 22, 23, 24, 25])
+_CA_NAMES = np.array([b" CA ", b"CA  ", b"  CA"], dtype="S4")
+
+
+def _contiguous_segments(residues: np.ndarray) -> list[tuple[int, int]]:
+    """Collapse an ordered residue-number array into inclusive (start, end) runs."""
+    if residues.size == 0:
+        return []
+    residues = residues[np.r_[True, residues[1:] != residues[:-1]]]
+    breaks = np.flatnonzero(np.diff(residues) != 1)
+    starts = residues[np.r_[0, breaks + 1]]
+    ends = residues[np.r_[breaks, residues.size - 1]]
+    return [(int(a), int(b)) for a, b in zip(starts, ends)]
+
+
+def parse_pdb_ca(
+    path: Path,
+) -> tuple[int, dict[str, int], dict[str, list[tuple[int, int]]], List[str]]:
+    """Summarize a PDB file's CA atoms and chains in a single pass.
+
+    Returns (ca_count, chain_lengths, chain_residue_segments, ordered_chain_ids).
+    Only the fixed-width columns we need are gathered into a NumPy array, so
+    ATOM/CA filtering and per-chain counting run vectorized over the raw bytes.
+    """
+    data = np.frombuffer(path.read_bytes(), dtype=np.uint8)
+    if data.size == 0:
+        return 0, {}, {}, []
+
+    newlines = np.flatnonzero(data == 0x0A)
+    line_starts = np.empty(newlines.size + 1, dtype=np.int64)
+    line_starts[0] = 0
+    line_starts[1:] = newlines + 1
+    line_ends = np.append(newlines, data.size)
+
+    atom_lines = np.flatnonzero(line_ends - line_starts >= 4)
+    for offset, byte in enumerate(b"ATOM"):
+        atom_lines = atom_lines[data[line_starts[atom_lines] + offset] == byte]
+    if atom_lines.size == 0:
+        return 0, {}, {}, []
+
+    starts = line_starts[atom_lines]
+    lengths = line_ends[atom_lines] - starts
+    index = np.minimum(starts[:, None] + _PDB_COLUMNS, data.size - 1)
+    fields = data[index]
+    fields[_PDB_COLUMNS >= lengths[:, None]] = 0x20
+
+    chain_bytes = fields[:, 4]
+    chain_bytes = np.where(chain_bytes == 0x20, ord("_"), chain_bytes)
+    unique_chains, first_seen = np.unique(chain_bytes, return_index=True)
+    ordered_chain_ids = [chr(c) for c in unique_chains[np.argsort(first_seen)]]
+
+    atom_names = np.ascontiguousarray(fields[:, 0:4]).view("S4").ravel()
+    is_ca = np.isin(atom_names, _CA_NAMES)
+    ca_chains = chain_bytes[is_ca]
+    ca_count = int(ca_chains.size)
+
+    chain_ids, counts = np.unique(ca_chains, return_counts=True)
+    count_by_chain = {chr(c): int(n) for c, n in zip(chain_ids, counts)}
+    chain_lengths = {c: count_by_chain[c] for c in ordered_chain_ids if c in count_by_chain}
+
+    residue_fields = np.ascontiguousarray(fields[is_ca, 5:9]).view("S4").ravel()
+    try:
+        residue_ids = residue_fields.astype(np.int64)
+        valid = np.ones(residue_ids.size, dtype=bool)
+    except ValueError:
+        residue_ids = np.zeros(residue_fields.size, dtype=np.int64)
+        valid = np.zeros(residue_fields.size, dtype=bool)
+        for i, field in enumerate(residue_fields):
+            try:
+                residue_ids[i] = int(field)
+                valid[i] = True
+            except ValueError:
+                continue
+
+    segments_by_chain: dict[str, list[tuple[int, int]]] = {}
+    for chain_id in chain_lengths:
+        residues = residue_ids[(ca_chains == ord(chain_id)) & valid]
+        if residues.size:
+            segments_by_chain[chain_id] = _contiguous_segments(residues)
+
+    return ca_count, chain_lengths, segments_by_chain, ordered_chain_ids
+
 
 def estimate_backbone_length(path: Path) -> int:
     """Estimate the number of residues from CA atoms in a PDB file."""
-    length = 0
-    for line in path.read_text().splitlines():
-        if line.startswith("ATOM") and line[12:16].strip() == "CA":
-            length += 1
-    return max(length, 60)
+    return max(parse_pdb_ca(path)[0], 60)
 
 
 def mmcif_auth_label_mapping(path: Path) -> tuple[dict[tuple[str, str], tuple[str, str]], dict[str, str]]:
@@ -48,63 +132,17 @@ def mmcif_auth_label_mapping(path: Path) -> tuple[dict[tuple[str, str], tuple[st
 
 def chain_lengths_from_pdb(path: Path) -> dict[str, int]:
     """Get the number of residues per chain from a PDB file."""
-    lengths: dict[str, int] = {}
-    for line in path.read_text().splitlines():
-        if line.startswith("ATOM") and line[12:16].strip() == "CA":
-            chain_id = line[21].strip() or "_"
-            lengths[chain_id] = lengths.get(chain_id, 0) + 1
-    return lengths
+    return parse_pdb_ca(path)[1]
 
 
 def chain_residue_segments_from_pdb(path: Path) -> dict[str, list[tuple[int, int]]]:
     """Get contiguous residue segments per chain from a PDB file."""
-    residues_by_chain: dict[str, list[int]] = {}
-    for line in path.read_text().splitlines():
-        if not line.startswith("ATOM"):
-            continue
-        if line[12:16].strip() != "CA":
-            continue
-        chain_id = line[21].strip() or "_"
-        residue_field = line[22:26].strip()
-        if not residue_field:
-            continue
-        try:
-            residue_id = int(residue_field)
-        except ValueError:
-            continue
-        residues = residues_by_chain.setdefault(chain_id, [])
-        if not residues or residues[-1] != residue_id:
-            residues.append(residue_id)
-
-    segments_by_chain: dict[str, list[tuple[int, int]]] = {}
-    for chain_id, residues in residues_by_chain.items():
-        if not residues:
-            continue
-        segments: list[tuple[int, int]] = []
-        start = residues[0]
-        prev = residues[0]
-        for residue_id in residues[1:]:
-            if residue_id == prev + 1:
-                prev = residue_id
-                continue
-            segments.append((start, prev))
-            start = residue_id
-            prev = residue_id
-        segments.append((start, prev))
-        segments_by_chain[chain_id] = segments
-
-    return segments_by_chain
+    return parse_pdb_ca(path)[2]
 
 
 def ordered_chain_ids_from_pdb(path: Path) -> List[str]:
     """Get chain IDs in order of appearance in a PDB file."""
-    seen: List[str] = []
-    for line in path.read_text().splitlines():
-        if line.startswith("ATOM"):
-            chain_id = line[21].strip() or "_"
-            if chain_id not in seen:
-                seen.append(chain_id)
-    return seen
+    return parse_pdb_ca(path)[3]
 
 
 def write_pdb_chains(source_path: Path, chain_ids: set[str], output_path: Path) -> dict[str, str]:
@@ -143,44 +181,94 @@ def write_pdb_chains(source_path: Path, chain_ids: set[str], output_path: Path)
         io.save(str(output_path), ChainSelect())
         return chain_id_map
 
-    # For PDB files, use line-based filtering (faster, preserves formatting)
-    keep_lines: List[str] = []
+    # For PDB files, use line-based filtering (faster, preserves formatting).
+    # Kept lines are written straight to the output instead of being collected.
     last_chain = None
     seen_chains: set[str] = set()
-    for line in source_path.read_text().splitlines():
-        if line.startswith(("ATOM", "HETATM")):
-            chain_id = line[21].strip() or "_"
-            if chain_id in chain_ids:
-                keep_lines.append(line)
-                last_chain = chain_id
-                seen_chains.add(chain_id)
-        elif line.startswith("TER") and last_chain in chain_ids:
-            keep_lines.append(line)
-        elif line.startswith("END"):
-            continue
-    keep_lines.append("END")
-    output_path.write_text("\n".join(keep_lines) + "\n")
+    with source_path.open("r", encoding="utf-8", buffering=1 << 20) as handle, open(
+        output_path, "w", encoding="utf-8", buffering=1 << 20
+    ) as out:
+        for line in handle:
+            if line.startswith(("ATOM", "HETATM")):
+                chain_id = line[21].strip() or "_"
+                if chain_id in chain_ids:
+                    out.write(line.rstrip("\n"))
+                    out.write("\n")
+                    last_chain = chain_id
+                    seen_chains.add(chain_id)
+            elif line.startswith("TER") and last_chain in chain_ids:
+                out.write(line.rstrip("\n"))
+                out.write("\n")
+            elif line.startswith("END"):
+                continue
+        out.write("END\n")
     # Return identity mapping for PDB files
     return {c: c for c in seen_chains}
 
 
+def cif_to_pdb_with_chains(cif_path: Path, pdb_path: Path) -> tuple[Path, List[str]]:
+    """Convert a CIF (optionally gzipped) file to PDB and report its chain IDs.
+
+    Chain IDs come from the in-memory gemmi structure (first model, in order of
+    appearance), so callers don't need to re-parse the written PDB.
+    """
+    import gemmi
+
+    structure = gemmi.read_structure(str(cif_path))
+    structure.write_pdb(str(pdb_path), gemmi.PdbWriteOptions(minimal=True))
+    ordered_chain_ids: List[str] = []
+    if len(structure):
+        for chain in structure[0]:
+            if chain.name not in ordered_chain_ids:
+                ordered_chain_ids.append(chain.name)
+    return pdb_path, ordered_chain_ids
+
+
 def cif_to_pdb(cif_path: Path, pdb_path: Path) -> Path:
-    """Convert a CIF file to PDB format using BioPython."""
-    from Bio.PDB import MMCIFParser, PDBIO
+    """Convert a CIF (optionally gzipped) file to PDB format using gemmi."""
+    return cif_to_pdb_with_chains(cif_path, pdb_path)[0]
+
 
-    parser = MMCIFParser(QUIET=True)
-    if cif_path.suffix == ".gz":
-        decompressed = pdb_path.with_suffix(".cif")
-        with gzip.open(cif_path, "rb") as handle:
-            decompressed.write_bytes(handle.read())
-        structure = parser.get_structure("struct", str(decompressed))
-    else:
-        structure = parser.get_structure("struct", str(cif_path))
+# Residues kept by cif_chain_sequences: the 20 standard amino acids plus
+# selenomethionine read as M. Other modified or unknown residues are skipped,
+# as Biopython's PPBuilder does on the PDB route.
+_CIF_SEQUENCE_LETTERS = {
+    "ALA": "A", "ARG": "R", "ASN": "N", "ASP": "D", "CYS": "C",
+    "GLN": "Q", "GLU": "E", "GLY": "G", "HIS": "H", "ILE": "I",
+    "LEU": "L", "LYS": "K", "MET": "M", "PHE": "F", "PRO": "P",
+    "SER": "S", "THR": "T", "TRP": "W", "TYR": "Y", "VAL": "V",
+    "MSE": "M",
+}
 
-    io = PDBIO()
-    io.set_structure(structure)
-    io.save(str(pdb_path))
-    return pdb_path
+
+def cif_chain_sequences(cif_path: Path) -> List[tuple[str, str]]:
+    """Read per-chain protein sequences from a CIF (optionally gzipped) with gemmi.
+
+    Avoids writing a PDB just to run Biopython over it. Chain IDs are the full
+    auth chain names from the first model, in order of appearance. Returns an
+    empty list if no protein chains are found; callers can fall back to the
+    PDB route.
+    """
+    import gemmi
+
+    structure = gemmi.read_structure(str(cif_path))
+    # Polymer spans need entity info, which many generated CIFs omit
+    structure.setup_entities()
+    structure.remove_alternative_conformations()
+    sequences: List[tuple[str, str]] = []
+    if not len(structure):
+        return sequences
+    peptide_types = (gemmi.PolymerType.PeptideL, gemmi.PolymerType.PeptideD)
+    for chain in structure[0]:
+        polymer = chain.get_polymer()
+        if not len(polymer) or polymer.check_polymer_type() not in peptide_types:
+            continue
+        sequence = "".join(
+            _CIF_SEQUENCE_LETTERS[res.name] for res in polymer if res.name in _CIF_SEQUENCE_LETTERS
+        )
+        if sequence:
+            sequences.append((chain.name, sequence))
+    return sequences
 
 
 def sequence_similarity(sequence_a: str, sequence_b: str) -> float:
@@ -222,7 +310,7 @@ def format_hotspot_residues(hotspots: list[str] | None, default_chain: str) -> s
     for residue in hotspots:
         if not residue:
             continue
-        match = re.search(r"([A-Za-z])\s*[:\-_/]?\s*(\d+)", residue)
+        match = HOTSPOT_RE.search(residue)
         if match:
             chain_id, res_id = match.groups()
         elif residue.isdigit():
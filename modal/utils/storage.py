@@ -4,6 +4,7 @@ Storage helpers for Cloudflare R2 / S3-compatible buckets.
 
 from __future__ import annotations
 
+import json
 import os
 from functools import lru_cache
 from pathlib import Path
@@ -11,9 +12,25 @@ from typing import Tuple
 
 import boto3
 import botocore.client
+from boto3.s3.transfer import TransferConfig
+import orjson
 import requests
 
 
+# Uploads are network-bound and boto3 clients are thread-safe, so callers
+# fan them out over a small thread pool.
+UPLOAD_MAX_WORKERS = 8
+
+# Files are streamed from disk by boto3's transfer manager; anything above the
+# threshold goes up as a parallel multipart upload. Concurrency per file is kept
+# modest since callers already upload several files at once.
+_FILE_TRANSFER_CONFIG = TransferConfig(
+  multipart_threshold=8 * 1024 * 1024,
+  multipart_chunksize=8 * 1024 * 1024,
+  max_concurrency=4,
+)
+
+
 class R2ConfigError(RuntimeError):
   """Raised when required environment variables are missing."""
 
@@ -67,8 +84,42 @@ def upload_bytes(data: bytes, key: str, content_type: str = "application/octet-s
   return {"key": key, "url": object_url(key)}
 
 
+def _json_default(obj):
+  if hasattr(obj, "tolist"):
+    return obj.tolist()
+  raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def upload_json(
+  obj,
+  key: str,
+  content_type: str = "application/json",
+  allow_nan: bool = False,
+) -> dict:
+  # orjson serializes straight to bytes (no str -> bytes copy) and handles
+  # numpy scalars/arrays, but writes NaN/Infinity as null. Callers whose
+  # payloads must keep NaN tokens pass allow_nan=True to use the stdlib.
+  if allow_nan:
+    data = json.dumps(obj, indent=2, default=_json_default).encode("utf-8")
+  else:
+    data = orjson.dumps(
+      obj,
+      option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+    )
+  return upload_bytes(data, key, content_type=content_type)
+
+
 def upload_file(path: Path, key: str, content_type: str = "application/octet-stream") -> dict:
-  return upload_bytes(path.read_bytes(), key, content_type=content_type)
+  client = get_r2_client()
+  bucket = _require_env("R2_BUCKET_NAME")
+  client.upload_file(
+    str(path),
+    bucket,
+    key,
+    ExtraArgs={"ContentType": content_type},
+    Config=_FILE_TRANSFER_CONFIG,
+  )
+  return {"key": key, "url": object_url(key)}
 
 
 def download_to_path(source: str, destination: Path) -> Path: